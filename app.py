@@ -3,10 +3,10 @@ TPC-C Flask Web Application
 NeonDB TPC-C Web Application
 """
 
+import gzip
 import logging
 import os
-from datetime import datetime
-from datetime import datetime
+from datetime import datetime, timezone
 import time
 
 # Load environment variables from .env file
@@ -121,6 +121,16 @@ def orders():
         status = request.args.get("status")
         limit = request.args.get("limit", 50, type=int)
         page = request.args.get("page", 1, type=int)
+        # Keyset cursor from the "Next" link (last row of the previous page)
+        after_date = request.args.get("after_date", type=datetime.fromisoformat)
+        after_w_id = request.args.get("after_w_id", type=int)
+        after_d_id = request.args.get("after_d_id", type=int)
+        after_id = request.args.get("after_id", type=int)
+        after_key = (
+            (after_w_id, after_d_id, after_id)
+            if None not in (after_w_id, after_d_id, after_id)
+            else None
+        )
 
         # Calculate offset
         offset = (page - 1) * limit
@@ -138,6 +148,8 @@ def orders():
             status=status,
             limit=limit,
             offset=offset,
+            after_date=after_date,
+            after_key=after_key,
         )
         logger.info(
             f"   ✅ Retrieved {len(orders_result.get('orders', []))} orders out of {orders_result.get('total_count', 0)} total"
@@ -166,6 +178,7 @@ def orders():
             "has_next": orders_result.get("has_next", False),
             "prev_page": page - 1 if page > 1 else None,
             "next_page": page + 1 if page < total_pages else None,
+            "next_cursor": orders_result.get("next_cursor"),
             "start_item": offset + 1 if total_count > 0 else 0,
             "end_item": min(offset + limit, total_count),
         }
@@ -332,6 +345,9 @@ def payments():
         customer_id = request.args.get("customer_id", type=int)
         limit = request.args.get("limit", 50, type=int)
         page = request.args.get("page", 1, type=int)
+        # Keyset cursor from the "Next" link (last row of the previous page)
+        after_date = request.args.get("after_date", type=datetime.fromisoformat)
+        after_id = request.args.get("after_id", type=int)
 
         # Calculate offset
         offset = (page - 1) * limit
@@ -349,6 +365,8 @@ def payments():
             customer_id=customer_id,
             limit=limit,
             offset=offset,
+            after_date=after_date,
+            after_id=after_id,
         )
         logger.info(
             f"   ✅ Retrieved {len(payments_result.get('payments', []))} payment records "
@@ -377,6 +395,7 @@ def payments():
             "has_next": payments_result.get("has_next", False),
             "prev_page": page - 1 if page > 1 else None,
             "next_page": page + 1 if page < total_pages else None,
+            "next_cursor": payments_result.get("next_cursor"),
             "start_item": offset + 1 if total_count > 0 else 0,
             "end_item": min(offset + limit, total_count),
         }
@@ -454,7 +473,7 @@ def delivery():
             "warehouse_id": warehouse_id,
             "carrier_id": carrier_id,
             "delivered_orders": delivered_orders,  
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }), 200
     except Exception as e:
         app.logger.error(f"Delivery failed: {e}")
@@ -552,12 +571,12 @@ def api_payment():
         # Convert result to JSON-compatible dict
         json_result = {
             "isSuccess": True,
-            "transaction_id": result["h_id"],
-            "customer_name": f"Customer {result['h_c_id']}",  # Replace if you have actual name
-            "amount": float(result["h_amount"]),
+            "transaction_id": result.h_id,
+            "customer_name": f"Customer {result.h_c_id}",  # Replace if you have actual name
+            "amount": float(result.h_amount),
             "new_balance": 1000.00,  # Replace with actual balance calculation if available
-            "timestamp": result["h_date"].isoformat(),
-            "data": result["h_data"]
+            "timestamp": result.h_date.isoformat(),
+            "data": result.h_data
         }
 
         execution_time = (time.time() - start_time) * 1000
@@ -903,19 +922,37 @@ def api_test_multi_region_recent_orders():
 def dashboard_metrics():
     try:
         metrics = analytics_service.get_dashboard_metrics()
-        return jsonify({"metrics": metrics})
+        response = jsonify({"metrics": metrics})
+        # Polling dashboards get 304 while the (cached) metrics are unchanged;
+        # mtime=0 keeps the gzip body, and so its ETag, stable
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            response.set_data(gzip.compress(response.get_data(), compresslevel=5, mtime=0))
+            response.headers["Content-Encoding"] = "gzip"
+        response.vary.add("Accept-Encoding")
+        response.add_etag()
+        return response.make_conditional(request)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
  
+@app.route("/api/cache/invalidate", methods=["POST"])
+def invalidate_cache():
+    """Drop cached dashboard metrics, e.g. after a batch of TPC-C writes"""
+    # A flush sends every dashboard reader back to the database at once, so
+    # only callers on the app's own host may trigger it (any caller in debug)
+    if not app.debug and request.remote_addr not in ("127.0.0.1", "::1"):
+        return jsonify({"error": "Cache invalidation is only allowed from localhost"}), 403
+    analytics_service.invalidate_cache()
+    return jsonify({"success": True})
+
 @app.route("/api/health")
 def api_health():
     """Health check endpoint"""
     try:
         health_status = {
             "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "provider": db_connector.get_provider_name(),
-            "database_connection": db_connector.test_connection(),
+            "database_connection": db_connector.test_connection(deep=True),
         }
 
         return jsonify(health_status)
@@ -925,7 +962,7 @@ def api_health():
         return jsonify(
             {
                 "status": "unhealthy",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
                 "error": str(e),
             }
         ), 500
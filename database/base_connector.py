@@ -20,13 +20,14 @@ class BaseDatabaseConnector(ABC):
     3. execute_query - Execute SQL queries
     """
 
+    provider_name = "Unknown"
+
     def __init__(self):
         self.connection = None
-        self.provider_name = "Unknown"
 
     @abstractmethod
-    def test_connection(self) -> bool:
-        """Test if database connection is working"""
+    def test_connection(self, deep: bool = False) -> bool:
+        """Test if database connection is working; deep=True forces a server round-trip"""
         pass
 
     @abstractmethod
@@ -36,6 +37,11 @@ class BaseDatabaseConnector(ABC):
         """Execute a query and return results as list of dictionaries"""
         pass
 
+    def execute_update(self, query: str, params: Optional[tuple] = None) -> int:
+        """Execute a write and return the affected row count (-1 when unknown)"""
+        self.execute_query(query, params)
+        return -1
+
     def get_provider_name(self) -> str:
         """Get the database provider name"""
         return self.provider_name
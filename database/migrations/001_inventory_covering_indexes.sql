@@ -0,0 +1,11 @@
+-- Covering indexes for InventoryService.get_inventory_paginated
+-- Lets the stock/item join be answered with Index Only Scans instead of heap fetches.
+-- Verify with: EXPLAIN (ANALYZE, BUFFERS) on the get_inventory_paginated query.
+
+CREATE INDEX IF NOT EXISTS idx_stock_cover
+    ON stock (s_w_id)
+    INCLUDE (s_i_id, s_quantity, s_ytd, s_order_cnt, s_data);
+
+CREATE INDEX IF NOT EXISTS idx_item_cover
+    ON item (i_id)
+    INCLUDE (i_name, i_price);
@@ -0,0 +1,8 @@
+-- Keyset pagination support for PaymentService.get_payment_history_paginated
+-- Pages are sought with (h_date, h_id) < (last_h_date, last_h_id) ORDER BY h_date DESC, h_id DESC.
+
+CREATE INDEX IF NOT EXISTS idx_history_date_id
+    ON history (h_date DESC, h_id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_history_customer_date_id
+    ON history (h_c_w_id, h_c_d_id, h_c_id, h_date DESC, h_id DESC);
@@ -0,0 +1,8 @@
+-- Partial index for low-stock scans (InventoryService.get_low_stock_items,
+-- get_inventory_statistics, get_warehouse_inventory_summary).
+-- The predicate sits slightly above the default threshold of 10 so the planner
+-- can use it for any threshold <= 20; verify with EXPLAIN.
+
+CREATE INDEX IF NOT EXISTS idx_stock_low
+    ON stock (s_w_id, s_quantity ASC, s_i_id)
+    WHERE s_quantity < 20;
@@ -0,0 +1,159 @@
+-- Server-side TPC-C transactions for NeonConnector.call_txn
+-- Each function runs a whole transaction in one round-trip, mirroring the
+-- statements OrderService / PaymentService / InventoryService issue from Python.
+
+CREATE OR REPLACE FUNCTION tpcc_new_order(
+    p_w_id INT,
+    p_d_id INT,
+    p_c_id INT,
+    p_item_ids INT[],
+    p_supply_w_ids INT[],
+    p_quantities INT[],
+    p_region VARCHAR DEFAULT NULL
+) RETURNS TABLE (order_id INT, items_count INT, all_local INT, total_amount NUMERIC)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_lines INT;
+BEGIN
+    -- Allocate the order id from the district counter (row lock serializes it)
+    UPDATE district
+    SET d_next_o_id = d_next_o_id + 1
+    WHERE d_w_id = p_w_id AND d_id = p_d_id
+    RETURNING d_next_o_id - 1 INTO order_id;
+
+    items_count := cardinality(p_item_ids);
+    all_local := CASE WHEN p_w_id = ALL (p_supply_w_ids) THEN 1 ELSE 0 END;
+
+    INSERT INTO orders (
+        o_id, o_d_id, o_w_id, o_c_id,
+        o_entry_d, o_carrier_id, o_ol_cnt, o_all_local, region_created
+    ) VALUES (order_id, p_d_id, p_w_id, p_c_id, NOW(), NULL, items_count, all_local, p_region);
+
+    INSERT INTO new_order (no_o_id, no_d_id, no_w_id) VALUES (order_id, p_d_id, p_w_id);
+
+    WITH ins AS (
+        INSERT INTO order_line (
+            ol_o_id, ol_d_id, ol_w_id, ol_number,
+            ol_i_id, ol_supply_w_id, ol_quantity, ol_amount, ol_delivery_d, ol_dist_info
+        )
+        SELECT order_id, p_d_id, p_w_id, l.n,
+               l.i_id, l.supply_w_id, l.qty, l.qty * i.i_price, NULL, rpad('DEFAULT DIST INFO', 24)
+        FROM unnest(p_item_ids, p_supply_w_ids, p_quantities) WITH ORDINALITY AS l (i_id, supply_w_id, qty, n)
+        JOIN item i ON i.i_id = l.i_id
+        RETURNING ol_amount
+    )
+    SELECT COUNT(*), COALESCE(SUM(ol_amount), 0) INTO v_lines, total_amount FROM ins;
+
+    IF v_lines <> items_count THEN
+        RAISE EXCEPTION 'Item price not found for order %', order_id;
+    END IF;
+
+    RETURN NEXT;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION tpcc_payment(p_w_id INT, p_d_id INT, p_c_id INT, p_amount NUMERIC)
+RETURNS SETOF history
+LANGUAGE sql AS $$
+    INSERT INTO history (h_w_id, h_c_d_id, h_c_w_id, h_d_id, h_c_id, h_date, h_amount, h_data)
+    VALUES (p_w_id, p_d_id, p_w_id, p_d_id, p_c_id, NOW(), p_amount, 'Payment transaction')
+    RETURNING *;
+$$;
+
+CREATE OR REPLACE FUNCTION tpcc_delivery(p_w_id INT, p_carrier_id INT)
+RETURNS TABLE (order_id INT, customer_id INT, district_id INT, amount NUMERIC)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_order RECORD;
+BEGIN
+    FOR d IN 1..10 LOOP
+        -- Pop the district's oldest new_order entry by primary key
+        DELETE FROM new_order
+        WHERE (no_w_id, no_d_id, no_o_id) = (
+            SELECT no_w_id, no_d_id, no_o_id
+            FROM new_order
+            WHERE no_w_id = p_w_id AND no_d_id = d
+            ORDER BY no_o_id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING no_o_id, no_d_id INTO v_order;
+        CONTINUE WHEN NOT FOUND;
+
+        UPDATE orders
+        SET o_carrier_id = p_carrier_id
+        WHERE o_w_id = p_w_id AND o_d_id = v_order.no_d_id AND o_id = v_order.no_o_id
+        RETURNING o_c_id INTO customer_id;
+
+        WITH upd AS (
+            UPDATE order_line
+            SET ol_delivery_d = CURRENT_TIMESTAMP
+            WHERE ol_w_id = p_w_id AND ol_d_id = v_order.no_d_id AND ol_o_id = v_order.no_o_id
+            RETURNING ol_amount
+        )
+        SELECT COALESCE(SUM(ol_amount), 0) INTO amount FROM upd;
+
+        UPDATE customer
+        SET c_balance = c_balance + amount,
+            c_delivery_cnt = c_delivery_cnt + 1
+        WHERE c_w_id = p_w_id AND c_d_id = v_order.no_d_id AND c_id = customer_id;
+
+        order_id := v_order.no_o_id;
+        district_id := v_order.no_d_id;
+        RETURN NEXT;
+    END LOOP;
+END;
+$$;
+
+-- Latest order of a customer with its lines, as one JSON document
+CREATE OR REPLACE FUNCTION tpcc_order_status(p_w_id INT, p_d_id INT, p_c_id INT)
+RETURNS jsonb
+LANGUAGE sql STABLE AS $$
+    SELECT jsonb_build_object(
+        'order', to_jsonb(o),
+        'order_lines', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                'ol_i_id', ol.ol_i_id,
+                'i_name', i.i_name,
+                'ol_quantity', ol.ol_quantity,
+                'ol_amount', ol.ol_amount,
+                'ol_supply_w_id', ol.ol_supply_w_id,
+                'ol_delivery_d', ol.ol_delivery_d
+            ))
+            FROM order_line ol
+            JOIN item i ON i.i_id = ol.ol_i_id
+            WHERE ol.ol_w_id = p_w_id AND ol.ol_d_id = p_d_id AND ol.ol_o_id = o.o_id
+        ), '[]'::jsonb)
+    )
+    FROM (
+        SELECT o_id, o_entry_d, o_carrier_id, c_first, c_middle, c_last, c_balance
+        FROM orders
+        JOIN customer ON o_w_id = c_w_id AND o_d_id = c_d_id AND o_c_id = c_id
+        WHERE o_w_id = p_w_id AND o_d_id = p_d_id AND o_c_id = p_c_id
+        ORDER BY o_id DESC
+        LIMIT 1
+    ) o;
+$$;
+
+CREATE OR REPLACE FUNCTION tpcc_stock_level(p_w_id INT, p_d_id INT, p_threshold INT)
+RETURNS bigint
+LANGUAGE sql STABLE AS $$
+    WITH n AS (
+        SELECT d_next_o_id
+        FROM district
+        WHERE d_w_id = p_w_id AND d_id = p_d_id
+    )
+    SELECT COUNT(DISTINCT s.s_i_id)
+    FROM stock s
+    WHERE s.s_w_id = p_w_id
+      AND s.s_quantity < p_threshold
+      AND EXISTS (
+          SELECT 1
+          FROM order_line ol
+          WHERE ol.ol_w_id = s.s_w_id
+            AND ol.ol_d_id = p_d_id
+            AND ol.ol_i_id = s.s_i_id
+            AND ol.ol_o_id >= (SELECT d_next_o_id - 20 FROM n)
+            AND ol.ol_o_id < (SELECT d_next_o_id FROM n)
+      );
+$$;
@@ -0,0 +1,7 @@
+-- Partial index for the dashboard's low_stock_items count
+-- (AnalyticsService._DASHBOARD_QUERIES), answered by an index-only scan.
+-- CONCURRENTLY avoids blocking stock writes; run it outside a transaction.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_stock_quantity_lt_100
+    ON stock (s_quantity)
+    WHERE s_quantity < 100;
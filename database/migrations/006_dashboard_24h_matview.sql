@@ -0,0 +1,34 @@
+-- Precomputed 24-hour dashboard figures, read by AnalyticsService when
+-- DASHBOARD_USE_MATVIEW=true instead of scanning orders / order_line per request.
+-- REFRESH ... CONCURRENTLY needs a unique index on a plain column, hence id.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS dashboard_24h AS
+SELECT
+    1 AS id,
+    (SELECT COUNT(*)
+     FROM orders
+     WHERE o_entry_d >= NOW() - INTERVAL '24 HOURS') AS orders_last_24h,
+    (SELECT AVG(sub.total_amount)
+     FROM (
+         SELECT ol_o_id, SUM(ol_amount) AS total_amount
+         FROM order_line
+         WHERE ol_delivery_d >= NOW() - INTERVAL '24 HOURS'
+         GROUP BY ol_o_id
+     ) sub) AS avg_order_value,
+    NOW() AS refreshed_at;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_dashboard_24h_id ON dashboard_24h (id);
+
+-- Refresh every minute with pg_cron when the extension is installed
+-- (CREATE EXTENSION pg_cron); otherwise run the REFRESH from any scheduler.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule(
+            'refresh-dashboard-24h',
+            '* * * * *',
+            'REFRESH MATERIALIZED VIEW CONCURRENTLY dashboard_24h'
+        );
+    END IF;
+END
+$$;
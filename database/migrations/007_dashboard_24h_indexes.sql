@@ -0,0 +1,11 @@
+-- Index-only scans for the dashboard's 24-hour figures
+-- (AnalyticsService._DASHBOARD_QUERIES avg_order_value and the dashboard_24h
+-- view in 006). The o_entry_d side (orders_last_24h, and
+-- OrderService.get_recent_orders' ORDER BY o_entry_d DESC LIMIT) is served by
+-- the leading column of idx_orders_entry_d_key in 009.
+-- Verify with EXPLAIN (ANALYZE, BUFFERS).
+-- CONCURRENTLY avoids blocking TPC-C writes; run it outside a transaction.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_order_line_delivery_d
+    ON order_line (ol_delivery_d)
+    INCLUDE (ol_o_id, ol_amount);
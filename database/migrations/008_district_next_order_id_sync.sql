@@ -0,0 +1,15 @@
+-- Bring district.d_next_o_id up to date with existing orders.
+-- New orders take their id from d_next_o_id (OrderService.execute_new_order,
+-- tpcc_new_order); orders created while ids came from MAX(o_id) + 1 may have
+-- left the counter behind. REQUIRED: run once before deploying; safe to re-run.
+
+UPDATE district d
+SET d_next_o_id = m.next_o_id
+FROM (
+    SELECT o_w_id, o_d_id, MAX(o_id) + 1 AS next_o_id
+    FROM orders
+    GROUP BY o_w_id, o_d_id
+) m
+WHERE d.d_w_id = m.o_w_id
+  AND d.d_id = m.o_d_id
+  AND d.d_next_o_id < m.next_o_id;
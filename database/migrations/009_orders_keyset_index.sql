@@ -0,0 +1,12 @@
+-- Keyset pagination support for OrderService.get_orders
+-- Pages are sought with (o_entry_d, o_w_id, o_d_id, o_id) < (last row)
+-- ORDER BY o_entry_d DESC, o_w_id DESC, o_d_id DESC, o_id DESC.
+-- Its o_entry_d DESC prefix also serves the dashboard's 24-hour order count
+-- and get_recent_orders, so the single-column idx_orders_entry_d that earlier
+-- versions of 007 created is redundant write overhead and is dropped.
+-- CONCURRENTLY avoids blocking TPC-C writes; run it outside a transaction.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_entry_d_key
+    ON orders (o_entry_d DESC, o_w_id DESC, o_d_id DESC, o_id DESC);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_entry_d;
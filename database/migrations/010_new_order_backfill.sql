@@ -0,0 +1,11 @@
+-- Queue every undelivered order in new_order.
+-- Delivery now pops the oldest new_order entry per district
+-- (OrderService.execute_delivery, tpcc_delivery) and new orders are queued
+-- there as they are created; orders created before that never were.
+-- REQUIRED: run once before deploying; safe to re-run.
+
+INSERT INTO new_order (no_o_id, no_d_id, no_w_id)
+SELECT o_id, o_d_id, o_w_id
+FROM orders
+WHERE o_carrier_id IS NULL
+ON CONFLICT DO NOTHING;
@@ -100,94 +100,646 @@
 #     """
 #     return NeonConnector()
 
+import functools
+import hashlib
 import logging
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import psycopg2
 import psycopg2.extras 
 from typing import Any, Dict, List, Optional
 from .base_connector import BaseDatabaseConnector
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 
 logger = logging.getLogger(__name__)
 
+# Row factories bound once for the query hot paths
+_RDC = RealDictCursor
+_NTC = psycopg2.extras.NamedTupleCursor
+
+# Process-wide pool shared by every NeonConnector so the TCP+TLS handshake to
+# Neon is paid once per pooled connection rather than once per connector
+_POOL: Optional[ThreadedConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+# One slot per pooled connection. getconn() raises PoolError as soon as the
+# pool is exhausted, so checkouts wait here for a free connection first
+_POOL_SLOTS: Optional[threading.BoundedSemaphore] = None
+# Worker threads for gather_reads; each query borrows its own pooled connection
+_READ_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+# Process-wide TTL result cache for read-mostly tables:
+# (query, params) -> (expires_at, rows), kept in LRU order, plus a
+# table -> keys index so writes through the connector evict stale entries
+_RESULT_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+_RESULT_CACHE_KEYS: Dict[str, set] = {}
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+# Statements PostgreSQL accepts in PREPARE
+_PREPARABLE_RE = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH|VALUES)\b", re.IGNORECASE)
+_RETURNS_ROWS_RE = re.compile(r"^\s*(SELECT|WITH|VALUES|SHOW)\b|\bRETURNING\b", re.IGNORECASE)
+_PLACEHOLDER_RE = re.compile(r"%(%|s|\((\w+)\)s)")
+_READ_TABLE_RE = re.compile(r"\b(?:FROM|JOIN)\s+([a-z_][a-z0-9_]*)", re.IGNORECASE)
+# Unanchored so data-modifying CTEs (WITH ... UPDATE district ...) count too
+_WRITE_TABLE_RE = re.compile(
+    r"\b(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+([a-z_][a-z0-9_]*)", re.IGNORECASE
+)
+_LOCKING_READ_RE = re.compile(r"\bFOR\s+(UPDATE|SHARE)\b", re.IGNORECASE)
+_READ_ONLY_RE = re.compile(r"^\s*(SELECT|WITH|VALUES|SHOW)\b", re.IGNORECASE)
+_IDENTIFIER_RE = re.compile(r"[a-z_][a-z0-9_]*", re.IGNORECASE)
+
+# Tables written by the server-side transaction functions in
+# migrations/004_tpcc_transaction_functions.sql
+_TXN_FUNCTION_WRITES = {
+    "tpcc_new_order": ("orders", "new_order", "order_line", "district"),
+    "tpcc_payment": ("history",),
+    "tpcc_delivery": ("new_order", "orders", "order_line", "customer"),
+}
+_TXN_FUNCTION_CALL_RE = re.compile(
+    r"\b(?:" + "|".join(_TXN_FUNCTION_WRITES) + r")\s*\(", re.IGNORECASE
+)
+
+# NUMERIC -> float typecaster; skips the text -> Decimal parse when callers
+# only need float precision (enabled with NEON_NUMERIC_AS_FLOAT=true)
+_NUMERIC_AS_FLOAT = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values,
+    "NEON_NUMERIC_AS_FLOAT",
+    lambda value, cur: float(value) if value is not None else None,
+)
+
+
+class _NeonConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers which statements it has PREPAREd"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # query text -> (statement name, param names or None, param count),
+        # or None when the query could not be prepared; kept in LRU order
+        self.stmt_cache: "OrderedDict[str, Optional[tuple]]" = OrderedDict()
+        if os.getenv("NEON_NUMERIC_AS_FLOAT", "false").lower() == "true":
+            psycopg2.extensions.register_type(_NUMERIC_AS_FLOAT, self)
+
+
+def _to_positional(query: str) -> Optional[tuple]:
+    """Rewrite psycopg2 %s / %(name)s placeholders to PostgreSQL $n parameters.
+
+    Returns (rewritten query, param names or None, param count), or None when the
+    query mixes placeholder styles or contains a bare %.
+    """
+    parts = []
+    names: List[str] = []
+    index: Dict[str, int] = {}
+    positional = 0
+    pos = 0
+    for match in _PLACEHOLDER_RE.finditer(query):
+        chunk = query[pos:match.start()]
+        if "%" in chunk:
+            return None
+        parts.append(chunk)
+        if match.group(1) == "%":
+            parts.append("%")
+        elif match.group(2) is None:
+            positional += 1
+            parts.append(f"${positional}")
+        else:
+            name = match.group(2)
+            if name not in index:
+                names.append(name)
+                index[name] = len(names)
+            parts.append(f"${index[name]}")
+        pos = match.end()
+    tail = query[pos:]
+    if "%" in tail or (positional and names):
+        return None
+    parts.append(tail)
+    if names:
+        return "".join(parts), names, len(names)
+    return "".join(parts), None, positional
+
+
+def _result_cache_get(key: tuple) -> Optional[list]:
+    with _RESULT_CACHE_LOCK:
+        entry = _RESULT_CACHE.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _RESULT_CACHE[key]
+            return None
+        _RESULT_CACHE.move_to_end(key)
+        return entry[1]
+
+
+def _result_cache_put(key: tuple, tables: set, rows: list, ttl: float, maxsize: int) -> None:
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE[key] = (time.monotonic() + ttl, rows)
+        _RESULT_CACHE.move_to_end(key)
+        for table in tables:
+            _RESULT_CACHE_KEYS.setdefault(table, set()).add(key)
+        while len(_RESULT_CACHE) > maxsize:
+            _RESULT_CACHE.popitem(last=False)
+
+
+def _result_cache_invalidate(query: str) -> None:
+    """Drop cached results for the tables a write statement modifies"""
+    for table in _WRITE_TABLE_RE.findall(query):
+        _result_cache_invalidate_table(table)
+
+
+def _result_cache_invalidate_table(table: str) -> None:
+    with _RESULT_CACHE_LOCK:
+        for key in _RESULT_CACHE_KEYS.pop(table.lower(), ()):
+            _RESULT_CACHE.pop(key, None)
+
+
+def _get_read_executor() -> ThreadPoolExecutor:
+    global _READ_EXECUTOR
+    if _READ_EXECUTOR is None:
+        with _POOL_LOCK:
+            if _READ_EXECUTOR is None:
+                _READ_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=int(os.getenv("NEON_GATHER_WORKERS", "4")),
+                    thread_name_prefix="neon-read",
+                )
+    return _READ_EXECUTOR
+
+
+def _get_pool(connection_string: str) -> ThreadedConnectionPool:
+    """Create the shared connection pool on first use"""
+    global _POOL, _POOL_SLOTS
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                maxconn = int(os.getenv("NEON_POOL_MAX", "20"))
+                _POOL_SLOTS = threading.BoundedSemaphore(maxconn)
+                _POOL = ThreadedConnectionPool(
+                    minconn=int(os.getenv("NEON_POOL_MIN", "5")),
+                    maxconn=maxconn,
+                    dsn=connection_string,
+                    sslmode=os.getenv("NEON_SSLMODE", "require"),
+                    application_name=os.getenv("NEON_APPLICATION_NAME", "tpcc-webapp"),
+                    # Keep idle pooled connections alive between bursts and
+                    # detect dead ones quickly instead of hanging on them
+                    keepalives=1,
+                    keepalives_idle=30,
+                    keepalives_interval=10,
+                    keepalives_count=3,
+                    tcp_user_timeout=15000,
+                    connection_factory=_NeonConnection,
+                )
+    return _POOL
+
+
+def _is_read_only(query: str) -> bool:
+    """True when query cannot modify data, so running it twice is harmless.
+
+    Conservative: anything with a write keyword (including FOR UPDATE), a
+    data-modifying CTE or a call to a tpcc_* write function counts as a write.
+    """
+    return bool(
+        _READ_ONLY_RE.match(query)
+        and not _WRITE_TABLE_RE.search(query)
+        and not _LOCKING_READ_RE.search(query)
+        and not _TXN_FUNCTION_CALL_RE.search(query)
+    )
+
+
+def _with_retry(fn):
+    """Retry a read-only query once on a fresh pooled connection after a dropped connection.
+
+    pooled_connection already discards the broken connection, so the retry
+    gets a healthy one instead of failing until the process restarts. Writes
+    are never retried: the error may arrive after the server committed, and
+    running them again could duplicate an order or a balance update.
+    """
+    @functools.wraps(fn)
+    def wrapper(self, query, *args, **kwargs):
+        if not _is_read_only(query):
+            return fn(self, query, *args, **kwargs)
+        try:
+            return fn(self, query, *args, **kwargs)
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            logger.warning(f"NeonDB connection lost, retrying once: {str(e)}")
+            self._reconnect()
+            return fn(self, query, *args, **kwargs)
+    return wrapper
+
+
 class NeonConnector(BaseDatabaseConnector):
+    provider_name = "NeonDB"
+
     def __init__(self):
         super().__init__()
-        self.provider_name = "NeonDB"
-        self.connection = None
         self.connection_string = os.getenv("NEON_CONNECTION_STRING")
 
         if not self.connection_string:
             raise ValueError("NEON_CONNECTION_STRING is not set in environment variables")
 
+        # Behind PgBouncer in transaction pooling mode, session state (PREPARE,
+        # WITH HOLD cursors) does not survive between transactions
+        self.pgbouncer = os.getenv("NEON_PGBOUNCER", "false").lower() == "true"
+        self.prepared_statements_enabled = not self.pgbouncer
+        self.stmt_cache_size = int(os.getenv("NEON_STMT_CACHE_SIZE", "500"))
+        self.result_cache_size = int(os.getenv("NEON_RESULT_CACHE", "2048"))
+        self.result_cache_ttl = float(os.getenv("NEON_RESULT_CACHE_TTL", "30"))
+        # Seconds a checkout waits for a free pooled connection before PoolError
+        self.pool_timeout = float(os.getenv("NEON_POOL_TIMEOUT", "30"))
+        # Pagination totals (cached_count) are reused for this long per filter
+        self.count_cache_ttl = float(os.getenv("NEON_COUNT_CACHE_TTL", "30"))
+        self.result_cache_tables = frozenset(
+            t.strip().lower()
+            for t in os.getenv("NEON_RESULT_CACHE_TABLES", "item,warehouse,district").split(",")
+            if t.strip()
+        )
+
         try:
-            # Establish connection
-            self.connection = psycopg2.connect(self.connection_string, sslmode="require")
-            self.connection.autocommit = True  # For read/write operations without manual commit
+            self.pool = _get_pool(self.connection_string)
             logger.info("Connected to NeonDB successfully")
         except Exception as e:
             logger.error(f"Failed to connect to NeonDB: {str(e)}")
             raise
 
-    def test_connection(self) -> bool:
+    @contextmanager
+    def pooled_connection(self):
+        """Borrow a connection from the shared pool and return it afterwards"""
+        # close_connection() closes the shared pool; getconn on it would raise PoolError
+        if self.pool.closed:
+            self._reconnect()
+        # Wait for a free connection instead of failing while all are checked out
+        slots = _POOL_SLOTS
+        if not slots.acquire(timeout=self.pool_timeout):
+            raise PoolError(f"No pooled connection became free within {self.pool_timeout}s")
+        try:
+            conn = self.pool.getconn()
+            try:
+                if not conn.autocommit:
+                    conn.autocommit = True  # For read/write operations without manual commit
+                yield conn
+            finally:
+                self.pool.putconn(conn, close=bool(conn.closed))
+        finally:
+            slots.release()
+
+    def _reconnect(self):
+        """Re-attach to the shared pool if it was closed underneath this connector"""
+        if self.pool.closed:
+            self.pool = _get_pool(self.connection_string)
+
+    def test_connection(self, deep: bool = False) -> bool:
+        """Check a pooled connection is usable.
+
+        The default check reads libpq's local connection state without a
+        round-trip; deep=True runs SELECT 1 against Neon (readiness probes).
+        """
         try:
-            with self.connection.cursor() as cur:
-                cur.execute("SELECT 1;")
-                result = cur.fetchone()
-                logger.info("NeonDB connection test passed")
-                return result[0] == 1
+            with self.pooled_connection() as conn:
+                if not deep:
+                    return (
+                        conn.closed == 0
+                        and conn.status == psycopg2.extensions.STATUS_READY
+                    )
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1;")
+                    result = cur.fetchone()
+                    logger.info("NeonDB connection test passed")
+                    return result[0] == 1
         except Exception as e:
             logger.error(f"NeonDB connection test failed: {str(e)}")
             return False
 
 
+    @_with_retry
     def execute_query(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        cached = self._result_cache_key(query, params)
+        if cached is not None:
+            rows = _result_cache_get(cached[0])
+            if rows is not None:
+                return [dict(row) for row in rows]
         try:
-            with self.connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                cur.execute(query, params or ())
-                if cur.description:  # If the query returns rows
-                    return [dict(row) for row in cur.fetchall()]
-                return []
+            with self.pooled_connection() as conn, conn.cursor(
+                cursor_factory=_RDC
+            ) as cur:
+                self._execute_cached(conn, cur, query, params)
+                rows = cur.fetchall() if cur.description else []
         except Exception as e:
             logger.error(f"NeonDB query execution failed: {str(e)}")
             raise
+        if cached is not None:
+            _result_cache_put(
+                cached[0], cached[1], [dict(row) for row in rows],
+                self.result_cache_ttl, self.result_cache_size,
+            )
+        else:
+            _result_cache_invalidate(query)
+        return rows
+
+    def gather_reads(
+        self, queries: List[tuple], return_exceptions: bool = False, fetch: str = "all"
+    ) -> List[Any]:
+        """Run independent (query, params) reads concurrently on separate pooled connections.
+
+        Results come back in input order, so N independent reads cost about
+        one round-trip instead of N. fetch selects what each result is:
+        "all" (execute_query rows), "row" (fetchrow) or "value" (fetchval).
+        With return_exceptions=True a failed query yields its exception in
+        place of a result instead of raising.
+        """
+        executor = _get_read_executor()
+        fn = {"all": self.execute_query, "row": self._fetchrow, "value": self._fetchval}[fetch]
+        # params pass through unchanged, so dict params stay a mapping
+        futures = [executor.submit(fn, query, params) for query, params in queries]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    def fetchval(self, query: str, *params) -> Any:
+        """Return the first column of the first row, or None when there are no rows"""
+        return self._fetchval(query, params)
+
+    def fetchrow(self, query: str, *params) -> Optional[tuple]:
+        """Return the first row as a plain tuple, or None when there are no rows"""
+        return self._fetchrow(query, params)
+
+    @_with_retry
+    def _fetchval(self, query: str, params=None) -> Any:
+        """fetchval taking params as one tuple or mapping, as execute_query does"""
+        with self.pooled_connection() as conn, conn.cursor() as cur:
+            self._execute_cached(conn, cur, query, params)
+            row = cur.fetchone()
+            return row[0] if row else None
+
+    @_with_retry
+    def _fetchrow(self, query: str, params=None) -> Optional[tuple]:
+        """fetchrow taking params as one tuple or mapping, as execute_query does"""
+        with self.pooled_connection() as conn, conn.cursor() as cur:
+            self._execute_cached(conn, cur, query, params)
+            return cur.fetchone()
+
+    def cached_count(self, query: str, params=None) -> int:
+        """Run a single-value COUNT query, reusing its result for NEON_COUNT_CACHE_TTL seconds.
+
+        Pagination totals only need to be roughly current; caching them per
+        filter keeps every page from rescanning the whole filtered set. The
+        entry lives in the result cache but is not evicted by writes.
+        """
+        if isinstance(params, dict):
+            key = ("count", query, tuple(sorted(params.items())))
+        else:
+            key = ("count", query, tuple(params or ()))
+        use_cache = self.result_cache_size > 0 and self.count_cache_ttl > 0
+        if use_cache:
+            cached = _result_cache_get(key)
+            if cached is not None:
+                return cached[0]
+        rows = self.execute_query(query, params)
+        count = next(iter(rows[0].values())) if rows else 0
+        if use_cache:
+            _result_cache_put(key, (), [count], self.count_cache_ttl, self.result_cache_size)
+        return count
+
+    def execute_query_tuples(self, query: str, params=None) -> List[tuple]:
+        """Execute a query and return namedtuple rows.
+
+        Cheaper than dict rows for results consumed in Python rather than
+        handed to templates or jsonify; use row._asdict() where a dict is needed.
+        """
+        try:
+            with self.pooled_connection() as conn, conn.cursor(cursor_factory=_NTC) as cur:
+                self._execute_cached(conn, cur, query, params)
+                return cur.fetchall() if cur.description else []
+        except Exception as e:
+            logger.error(f"NeonDB query execution failed: {str(e)}")
+            raise
+
+    def execute_update(self, query: str, params=None) -> int:
+        """Execute an INSERT/UPDATE/DELETE and return the affected row count.
+
+        Uses a plain tuple cursor and never inspects a result set.
+        """
+        try:
+            with self.pooled_connection() as conn, conn.cursor() as cur:
+                self._execute_cached(conn, cur, query, params)
+                rowcount = cur.rowcount
+        except Exception as e:
+            logger.error(f"NeonDB update execution failed: {str(e)}")
+            raise
+        _result_cache_invalidate(query)
+        return rowcount
+
+    def _result_cache_key(self, query: str, params=None) -> Optional[tuple]:
+        """(cache key, tables read) when query only reads cacheable tables, else None"""
+        if self.result_cache_size <= 0 or not query.lstrip()[:6].upper() == "SELECT":
+            return None
+        if _LOCKING_READ_RE.search(query):
+            return None
+        tables = {t.lower() for t in _READ_TABLE_RE.findall(query)}
+        if not tables or not tables <= self.result_cache_tables:
+            return None
+        if isinstance(params, dict):
+            params = tuple(sorted(params.items()))
+        key = (query, tuple(params) if params else ())
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key, tables
+
+    def _prepare(self, conn, cur, query: str) -> Optional[tuple]:
+        """PREPARE query on conn; returns its cache entry or None if it cannot be prepared"""
+        body = query.strip().rstrip(";")
+        if not _PREPARABLE_RE.match(body) or ";" in body:
+            return None
+        converted = _to_positional(body)
+        if converted is None:
+            return None
+        pg_query, names, count = converted
+        name = "s_" + hashlib.blake2b(query.encode(), digest_size=8).hexdigest()
+        try:
+            cur.execute(f"PREPARE {name} AS {pg_query}")
+        except psycopg2.Error as e:
+            # e.g. parameter types the planner cannot infer; run it unprepared
+            logger.debug(f"Statement not prepared, executing directly: {str(e)}")
+            return None
+        return name, names, count
+
+    def _execute_cached(self, conn, cur, query: str, params=None):
+        """Execute query through the connection's LRU of prepared statements"""
+        # Never PREPARE inside an open transaction: a failed PREPARE would abort it
+        in_transaction = (
+            conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        )
+        if not self.prepared_statements_enabled or (
+            in_transaction and query not in conn.stmt_cache
+        ):
+            cur.execute(query, params or ())
+            return
+
+        cache = conn.stmt_cache
+        if query in cache:
+            cache.move_to_end(query)
+            entry = cache[query]
+        else:
+            entry = self._prepare(conn, cur, query)
+            cache[query] = entry
+            if len(cache) > self.stmt_cache_size:
+                _, evicted = cache.popitem(last=False)
+                if evicted is not None:
+                    cur.execute(f"DEALLOCATE {evicted[0]}")
+
+        if entry is None:
+            cur.execute(query, params or ())
+            return
+
+        name, names, count = entry
+        if names is not None:
+            args = tuple(params[n] for n in names)
+        else:
+            args = tuple(params or ())
+            if len(args) != count:
+                cur.execute(query, params or ())
+                return
+        if count:
+            cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * count)})", args)
+        else:
+            cur.execute(f"EXECUTE {name}")
+
+    def execute_many(
+        self,
+        query: str,
+        seq_of_params: List[tuple],
+        page_size: int = 100,
+        template: Optional[str] = None,
+    ) -> List[tuple]:
+        """Run query for every params tuple in batched round-trips, all or nothing.
+
+        INSERT templates ending in ``VALUES %s`` go through execute_values as
+        multi-row INSERTs (template shapes each row) and return the rows of a
+        RETURNING clause; anything else (e.g. UPDATEs) goes through
+        execute_batch and returns []. Every page runs in one transaction, so a
+        failing page rolls back the pages before it.
+        """
+        if not seq_of_params:
+            return []
+        try:
+            with self.pooled_connection() as conn, conn.cursor() as cur:
+                cur.execute("BEGIN")
+                try:
+                    if re.search(r"\bVALUES\s+%s", query, re.IGNORECASE):
+                        rows = psycopg2.extras.execute_values(
+                            cur,
+                            query,
+                            seq_of_params,
+                            template=template,
+                            page_size=page_size,
+                            fetch=bool(re.search(r"\bRETURNING\b", query, re.IGNORECASE)),
+                        )
+                    else:
+                        psycopg2.extras.execute_batch(cur, query, seq_of_params, page_size=page_size)
+                        rows = None
+                    cur.execute("COMMIT")
+                except Exception:
+                    if not conn.closed:
+                        cur.execute("ROLLBACK")
+                    raise
+        except Exception as e:
+            logger.error(f"NeonDB batch execution failed: {str(e)}")
+            raise
+        _result_cache_invalidate(query)
+        return rows or []
+
+    def execute_transaction(self, stmts: List[tuple]) -> List[Optional[List[Dict[str, Any]]]]:
+        """Run (query, params) pairs atomically in as few round-trips as possible.
+
+        psycopg2 has no libpq pipeline mode, so statements that return no rows
+        are mogrified and sent together with the next row-returning statement
+        (or the COMMIT) as one multi-statement string. Returns one entry per
+        statement: its rows, or None.
+        """
+        results = []
+        with self.pooled_connection() as conn, conn.cursor(
+            cursor_factory=_RDC
+        ) as cur:
+            pending = ["BEGIN"]
+            try:
+                for query, params in stmts:
+                    pending.append(cur.mogrify(query, params).decode())
+                    results.append(None)
+                    if _RETURNS_ROWS_RE.search(query):
+                        cur.execute(";".join(pending))
+                        if cur.description:
+                            results[-1] = cur.fetchall()
+                        pending = []
+                cur.execute(";".join(pending + ["COMMIT"]))
+                for query, _ in stmts:
+                    _result_cache_invalidate(query)
+            except Exception as e:
+                logger.error(f"NeonDB transaction failed: {str(e)}")
+                if not conn.closed:
+                    cur.execute("ROLLBACK")
+                raise
+        return results
+
+    # Name used by tests/acid_tests.py
+    execute_in_transaction = execute_transaction
 
+    def call_txn(self, fn: str, *args) -> List[Dict[str, Any]]:
+        """Run a server-side transaction function in a single round-trip.
+
+        e.g. call_txn("tpcc_new_order", w_id, d_id, c_id, item_ids, supply_w_ids, quantities)
+        """
+        if not _IDENTIFIER_RE.fullmatch(fn):
+            raise ValueError(f"Invalid function name: {fn}")
+        rows = self.execute_query(
+            f"SELECT * FROM {fn}({', '.join(['%s'] * len(args))})", args
+        )
+        for table in _TXN_FUNCTION_WRITES.get(fn, ()):
+            _result_cache_invalidate_table(table)
+        return rows
+
+    @contextmanager
     def cursor(self, dictionary=False):
-        if dictionary:
-            return self.connection.cursor(cursor_factory=psycopg2.extras.DictCursor)
-        return self.connection.cursor()
+        with self.pooled_connection() as conn:
+            cursor_factory = psycopg2.extras.DictCursor if dictionary else None
+            with conn.cursor(cursor_factory=cursor_factory) as cur:
+                yield cur
     
+    @_with_retry
     def fetch_one(self, query, params=None):
-        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+        with self.pooled_connection() as conn, conn.cursor(
+            cursor_factory=_RDC
+        ) as cursor:
             cursor.execute(query, params or ())
             result = cursor.fetchone()
-            print(f"fetch_one result: {result}")
+            logger.debug(f"fetch_one result: {result}")
             return result
-
-        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-            if params is None:
-                params = ()  # Pass empty tuple if no params
-            cursor.execute(query, params)
-            return cursor.fetchone()
-    # def fetch_one(self, query, params=None):
-    #     with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-    #         cursor.execute(query, params or {})
-    #         return cursor.fetchone()  
         
+    @_with_retry
     def fetch_all(self, query, params=None):
-        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+        with self.pooled_connection() as conn, conn.cursor(
+            cursor_factory=_RDC
+        ) as cursor:
             cursor.execute(query, params or {})
             return cursor.fetchall()
-        
-    def get_provider_name(self) -> str:
-        return self.provider_name
 
-    
     def close_connection(self):
+        global _POOL
         try:
-            if self.connection:
-                self.connection.close()
-                logger.info("NeonDB connection closed successfully")
+            with _POOL_LOCK:
+                if _POOL is not None and not _POOL.closed:
+                    _POOL.closeall()
+                    logger.info("NeonDB connection pool closed successfully")
+                _POOL = None
         except Exception as e:
             logger.error(f"Connection cleanup failed: {str(e)}")
 # # ✅ This function must be outside the class
@@ -4,17 +4,75 @@ Uses skeleton connectors that participants will implement
 """
 
 import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
 from typing import Any, Dict
-from datetime import datetime, timedelta
-
-# from database.base_connector import create_study_connector
 
 from database.neon_connector import create_study_connector
 
-# from database.connector_factory import create_study_connector
-
 logger = logging.getLogger(__name__)
 
+# Process-wide cache of dashboard results: key -> (expires_at, result).
+# The lock also makes concurrent misses wait for one refresh instead of
+# all hitting the database
+_DASHBOARD_CACHE: Dict[str, tuple] = {}
+_DASHBOARD_CACHE_LOCK = threading.Lock()
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "45"))
+# Counts that are effectively constant during a TPC-C run, cached far longer
+_DASHBOARD_COLD_KEYS = ("total_warehouses", "total_customers", "total_items")
+DASHBOARD_COLD_CACHE_TTL = float(os.getenv("DASHBOARD_COLD_CACHE_TTL", "3600"))
+
+# Dashboard figures -> query returning them as one row, in that order.
+# orders_last_24h / avg_order_value rely on idx_orders_entry_d_key
+# (migrations/009_orders_keyset_index.sql) and idx_order_line_delivery_d
+# (migrations/007_dashboard_24h_indexes.sql); they
+# share one statement so the 24-hour window costs one connection and round-trip
+_DASHBOARD_QUERIES = {
+    ("total_warehouses",): "SELECT COUNT(*) FROM warehouse",
+    ("total_customers",): "SELECT COUNT(*) FROM customer",
+    ("total_orders",): "SELECT COUNT(*) FROM orders",
+    ("total_items",): "SELECT COUNT(*) FROM item",
+    ("orders_last_24h", "avg_order_value"): """
+        SELECT
+            (SELECT COUNT(*)
+             FROM orders
+             WHERE o_entry_d >= NOW() - INTERVAL '24 HOURS'),
+            (SELECT AVG(sub.total_amount)
+             FROM (
+                 SELECT ol_o_id, SUM(ol_amount) AS total_amount
+                 FROM order_line
+                 WHERE ol_delivery_d >= NOW() - INTERVAL '24 HOURS'
+                 GROUP BY ol_o_id
+             ) sub)
+    """,
+    ("low_stock_items",): "SELECT COUNT(*) FROM stock WHERE s_quantity < 100",
+    ("stock_items",): "SELECT COUNT(*) FROM stock",
+}
+
+# Read the 24-hour figures from the dashboard_24h materialized view
+# (migrations/006_dashboard_24h_matview.sql) instead of computing them live
+if os.getenv("DASHBOARD_USE_MATVIEW", "false").lower() == "true":
+    _DASHBOARD_QUERIES[("orders_last_24h", "avg_order_value")] = (
+        "SELECT orders_last_24h, avg_order_value FROM dashboard_24h"
+    )
+
+
+@dataclass
+class DashboardMetrics:
+    """Figures shown on the dashboard; defaults are used when a query fails"""
+
+    total_warehouses: int = 0
+    total_customers: int = 0
+    total_orders: int = 0
+    total_items: int = 0
+    new_orders: int = 0
+    low_stock_items: int = 0
+    stock_items: int = 0
+    orders_last_24h: int = 0
+    avg_order_value: float = 0.0
+
 
 class AnalyticsService:
     """
@@ -24,18 +82,10 @@ class AnalyticsService:
     that participants will implement during the study.
     """
 
-    # def __init__(self, db_connector):
-    #     self.db_connector = db_connector
-    #     self.connector = db_connector  # 👈 alias for backward compatibility
     def __init__(self, db_connector):
         self.db_connector = db_connector
         self.connector = db_connector  # alias for backward compatibility
         self.db = db_connector 
-        
-    # def __init__(self):
-    #     """Initialize the study analytics service"""
-    #     self.connector = None
-    #     self._initialize_connector()
 
     def _initialize_connector(self):
         """Initialize the database connector for the study"""
@@ -77,108 +127,37 @@ class AnalyticsService:
                 "provider": self.connector.get_provider_name(),
             }
 
-    # def get_dashboard_metrics(self) -> Dict[str, Any]:
-    #     if not self.connector:
-    #         return {
-    #             "error": "No database connector available",
-    #             "metrics": self._get_default_metrics(),
-    #         }
-
-    #     try:
-    #         if not self.connector.test_connection():
-    #             return {
-    #                 "error": "Database connection failed",
-    #                 "metrics": self._get_default_metrics(),
-    #             }
-
-    #         metrics = {}
-
-    #         # Warehouse count
-    #         try:
-    #             result = self.connector.execute_query("SELECT COUNT(*) as count FROM warehouse")
-    #             metrics["total_warehouses"] = result[0].get("count", 0) if result else 0
-    #         except Exception as e:
-    #             logger.warning(f"Failed to get warehouse count: {str(e)}")
-    #             metrics["total_warehouses"] = 0
-
-    #         # Customer count
-    #         try:
-    #             result = self.connector.execute_query("SELECT COUNT(*) as count FROM customer")
-    #             metrics["total_customers"] = result[0].get("count", 0) if result else 0
-    #         except Exception as e:
-    #             logger.warning(f"Failed to get customer count: {str(e)}")
-    #             metrics["total_customers"] = 0
-
-    #         # Order count
-    #         try:
-    #             result = self.connector.execute_query("SELECT COUNT(*) as count FROM orders")
-    #             metrics["total_orders"] = result[0].get("count", 0) if result else 0
-    #         except Exception as e:
-    #             logger.warning(f"Failed to get order count: {str(e)}")
-    #             metrics["total_orders"] = 0
-
-    #         # Item count
-    #         try:
-    #             result = self.connector.execute_query("SELECT COUNT(*) as count FROM item")
-    #             metrics["total_items"] = result[0].get("count", 0) if result else 0
-    #         except Exception as e:
-    #             logger.warning(f"Failed to get item count: {str(e)}")
-    #             metrics["total_items"] = 0
-
-    #         # Recent orders and avg value in last 24h
-    #         try:
-    #             query_recent = """
-    #             SELECT COUNT(*) AS orders_last_24h
-    #                 FROM orders
-    #                 WHERE o_entry_d >= NOW() - INTERVAL '24 HOURS';
-    #             """
-    #             result = self.connector.execute_query(query_recent)
-
-    #             if result and len(result) > 0:
-    #                 metrics["orders_last_24h"] = result[0].get("orders_last_24h", 0)
-    #                 avg_val = result[0].get("avg_order_value")
-    #                 metrics["avg_order_value"] = float(avg_val) if avg_val is not None else 0.0
-    #             else:
-    #                 metrics["orders_last_24h"] = 0
-    #                 metrics["avg_order_value"] = 0.0
-    #         query_avg_order_value = """
-    #                 SELECT 
-    #                     AVG(sub.total_amount) AS avg_order_value
-    #                 FROM (
-    #                     SELECT ol_o_id, SUM(ol_amount) AS total_amount
-    #                     FROM order_line
-    #                     WHERE ol_delivery_d >= NOW() - INTERVAL '24 HOURS'
-    #                     GROUP BY ol_o_id
-    #                 ) sub;
-    #             """
-
-    #     result = self.connector.execute_query(query_avg_order_value)
-
-    #     if result and len(result) > 0:
-    #         avg_val = result[0].get("avg_order_value")
-    #         metrics["avg_order_value"] = float(avg_val) if avg_val is not None else 0.0
-    #     else:
-    #         metrics["avg_order_value"] = 0.0
-    #         except Exception as e:
-    #             logger.warning(f"Failed to get recent orders metrics: {str(e)}")
-    #             metrics["orders_last_24h"] = 0
-    #             metrics["avg_order_value"] = 0.0
-
-    #         return {
-    #             "success": True,
-    #             "provider": self.connector.get_provider_name(),
-    #             "metrics": metrics,
-    #         }
-
-    #     except Exception as e:
-    #         logger.error(f"Failed to get dashboard metrics: {str(e)}")
-    #         return {
-    #             "error": str(e),
-    #             "provider": self.connector.get_provider_name() if self.connector else "Unknown",
-    #             "metrics": self._get_default_metrics(),
-    #         }
-
     def get_dashboard_metrics(self) -> Dict[str, Any]:
+        """Dashboard metrics, served from a short-lived cache when fresh.
+
+        Refreshes are single-flight: callers arriving while one is running
+        wait for it and share its result, even an uncached failure, instead
+        of each querying the database in turn.
+        """
+        cached = _DASHBOARD_CACHE.get("dashboard")
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        arrived = time.monotonic()
+        with _DASHBOARD_CACHE_LOCK:
+            cached = _DASHBOARD_CACHE.get("dashboard")
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+            last = _DASHBOARD_CACHE.get("last")
+            if last and last[0] >= arrived:
+                return last[1]
+            result = self._load_dashboard_metrics()
+            now = time.monotonic()
+            _DASHBOARD_CACHE["last"] = (now, result)
+            if result.get("success"):
+                _DASHBOARD_CACHE["dashboard"] = (now + DASHBOARD_CACHE_TTL, result)
+            return result
+
+    def invalidate_cache(self):
+        """Drop cached dashboard metrics so the next request recomputes them"""
+        with _DASHBOARD_CACHE_LOCK:
+            _DASHBOARD_CACHE.clear()
+
+    def _load_dashboard_metrics(self) -> Dict[str, Any]:
         if not self.connector:
             return {
                 "error": "No database connector available",
@@ -186,113 +165,53 @@ class AnalyticsService:
             }
 
         try:
-            if not self.connector.test_connection():
+            metrics = DashboardMetrics()
+
+            # Cold counts come from their own long-lived cache entry when fresh;
+            # the caller holds _DASHBOARD_CACHE_LOCK
+            cold = _DASHBOARD_CACHE.get("cold")
+            cold_fresh = cold is not None and cold[0] > time.monotonic()
+            if cold_fresh:
+                for name, value in cold[1].items():
+                    setattr(metrics, name, value)
+            keys = [
+                names for names in _DASHBOARD_QUERIES
+                if not (cold_fresh and set(names) <= set(_DASHBOARD_COLD_KEYS))
+            ]
+
+            # The figures are independent, so run them concurrently on separate
+            # pooled connections: latency is the slowest query, not the sum
+            results = self.connector.gather_reads(
+                [(_DASHBOARD_QUERIES[names], None) for names in keys],
+                return_exceptions=True,
+                fetch="row",
+            )
+            failed = set()
+            for names, row in zip(keys, results):
+                if isinstance(row, Exception):
+                    logger.warning(f"Failed to get {', '.join(names)}: {str(row)}")
+                    failed.update(names)
+                elif row is not None:
+                    for name, value in zip(names, row):
+                        if value is not None:
+                            setattr(metrics, name, value)
+            if len(failed) == sum(len(names) for names in keys):
                 return {
                     "error": "Database connection failed",
                     "metrics": self._get_default_metrics(),
                 }
+            metrics.avg_order_value = float(metrics.avg_order_value)
 
-            metrics = {}
-
-            # Warehouse count
-            try:
-                result = self.connector.execute_query("SELECT COUNT(*) as count FROM warehouse")
-                metrics["total_warehouses"] = result[0].get("count", 0) if result else 0
-            except Exception as e:
-                logger.warning(f"Failed to get warehouse count: {str(e)}")
-                metrics["total_warehouses"] = 0
-
-            # Customer count
-            try:
-                result = self.connector.execute_query("SELECT COUNT(*) as count FROM customer")
-                metrics["total_customers"] = result[0].get("count", 0) if result else 0
-            except Exception as e:
-                logger.warning(f"Failed to get customer count: {str(e)}")
-                metrics["total_customers"] = 0
-
-            # Order count
-            try:
-                result = self.connector.execute_query("SELECT COUNT(*) as count FROM orders")
-                metrics["total_orders"] = result[0].get("count", 0) if result else 0
-            except Exception as e:
-                logger.warning(f"Failed to get order count: {str(e)}")
-                metrics["total_orders"] = 0
-
-            # Item count
-            try:
-                result = self.connector.execute_query("SELECT COUNT(*) as count FROM item")
-                metrics["total_items"] = result[0].get("count", 0) if result else 0
-            except Exception as e:
-                logger.warning(f"Failed to get item count: {str(e)}")
-                metrics["total_items"] = 0
-
-            # Recent orders count (last 24 hours)
-            try:
-                query_recent = """
-                    SELECT COUNT(*) AS orders_last_24h
-                    FROM orders
-                    WHERE o_entry_d >= NOW() - INTERVAL '24 HOURS';
-                """
-                result = self.connector.execute_query(query_recent)
-                metrics["orders_last_24h"] = result[0].get("orders_last_24h", 0) if result else 0
-            except Exception as e:
-                logger.warning(f"Failed to get orders last 24h: {str(e)}")
-                metrics["orders_last_24h"] = 0
-
-            try:
-                query_recent = """
-                SELECT Count(*) As low_stock_items
-                FROM stock s
-                JOIN item i ON i.i_id = s.s_i_id
-                JOIN warehouse w ON w.w_id = s.s_w_id
-                WHERE s.s_quantity < 100
-                LIMIT 10;
-                """
-                result = self.connector.execute_query(query_recent)
-                metrics["low_stock_items"] = result[0].get("low_stock_items", 0) if result else 0
-            except Exception as e:
-                logger.warning(f"Failed to get low stock items: {str(e)}")
-                metrics["low_stock_items"] = []
-
-            try:
-                query_recent = """
-                SELECT Count(*) As stock_items
-                FROM stock s
-                JOIN item i ON i.i_id = s.s_i_id
-                JOIN warehouse w ON w.w_id = s.s_w_id
-                """
-                result = self.connector.execute_query(query_recent)
-                metrics["stock_items"] = result[0].get("stock_items", 0) if result else 0
-            except Exception as e:
-                logger.warning(f"Failed to get stock items: {str(e)}")
-                metrics["stock_items"] = []
-
-            # Average order value (last 24 hours)
-            try:
-                query_avg_order_value = """
-                    SELECT 
-                        AVG(sub.total_amount) AS avg_order_value
-                    FROM (
-                        SELECT ol_o_id, SUM(ol_amount) AS total_amount
-                        FROM order_line
-                        WHERE ol_delivery_d >= NOW() - INTERVAL '24 HOURS'
-                        GROUP BY ol_o_id
-                    ) sub;
-                """
-                result = self.connector.execute_query(query_avg_order_value)
-                if result and len(result) > 0:
-                    avg_val = result[0].get("avg_order_value")
-                    metrics["avg_order_value"] = float(avg_val) if avg_val is not None else 0.0
-                else:
-                    metrics["avg_order_value"] = 0.0
-            except Exception as e:
-                logger.warning(f"Failed to get average order value: {str(e)}")
-                metrics["avg_order_value"] = 0.0
+            if not cold_fresh and not failed.intersection(_DASHBOARD_COLD_KEYS):
+                _DASHBOARD_CACHE["cold"] = (
+                    time.monotonic() + DASHBOARD_COLD_CACHE_TTL,
+                    {name: getattr(metrics, name) for name in _DASHBOARD_COLD_KEYS},
+                )
 
             return {
                 "success": True,
                 "provider": self.connector.get_provider_name(),
-                "metrics": metrics,
+                "metrics": asdict(metrics),
             }
 
         except Exception as e:
@@ -303,193 +222,6 @@ class AnalyticsService:
                 "metrics": self._get_default_metrics(),
             }
 
-
-    # def get_dashboard_metrics(self) -> Dict[str, Any]:
-    #     if not self.connector:
-    #         return {
-    #             "error": "No database connector available",
-    #             "metrics": self._get_default_metrics(),
-    #         }
-
-    #     try:
-    #         if not self.connector.test_connection():
-    #             return {
-    #                 "error": "Database connection failed",
-    #                 "metrics": self._get_default_metrics(),
-    #             }
-
-    #         metrics = {}
-
-    #         # Warehouse count
-    #         try:
-    #             result = self.connector.execute_query("SELECT COUNT(*) as count FROM warehouse")
-    #             metrics["total_warehouses"] = result[0].get("count", 0) if result else 0
-    #         except Exception as e:
-    #             logger.warning(f"Failed to get warehouse count: {str(e)}")
-    #             metrics["total_warehouses"] = 0
-
-    #         # Customer count
-    #         try:
-    #             result = self.connector.execute_query("SELECT COUNT(*) as count FROM customer")
-    #             metrics["total_customers"] = result[0].get("count", 0) if result else 0
-    #         except Exception as e:
-    #             logger.warning(f"Failed to get customer count: {str(e)}")
-    #             metrics["total_customers"] = 0
-
-    #         # Order count
-    #         try:
-    #             result = self.connector.execute_query("SELECT COUNT(*) as count FROM orders")
-    #             metrics["total_orders"] = result[0].get("count", 0) if result else 0
-    #         except Exception as e:
-    #             logger.warning(f"Failed to get order count: {str(e)}")
-    #             metrics["total_orders"] = 0
-
-    #         # Item count
-    #         try:
-    #             result = self.connector.execute_query("SELECT COUNT(*) as count FROM item")
-    #             metrics["total_items"] = result[0].get("count", 0) if result else 0
-    #         except Exception as e:
-    #             logger.warning(f"Failed to get item count: {str(e)}")
-    #             metrics["total_items"] = 0
-
-    #         # Recent orders count and average order value (last 24 hours)
-    #         try:
-    #             since = datetime.utcnow() - timedelta(days=1)
-    #             query_recent = """
-    #                             SELECT 
-    #                 COUNT(DISTINCT o_id) AS orders_last_24h,
-    #                 AVG(sub.total_amount) AS avg_order_value
-    #             FROM (
-    #                 SELECT ol_o_id AS o_id, SUM(ol_amount) AS total_amount
-    #                 FROM order_line
-    #                 WHERE ol_delivery_d >= NOW() - INTERVAL '24 HOURS'
-    #                 GROUP BY ol_o_id
-    #             ) sub;
-
-                 
-    #             """
-    #             result = self.connector.execute_query(query_recent, (since,))
-
-    #             print(f"Dashboard : {result}")
-    #             if result and len(result) > 0:
-    #                 metrics["orders_last_24h"] = result[0].get("orders_last_24h", 0)
-    #                 avg_val = result[0].get("avg_order_value")
-    #                 metrics["avg_order_value"] = float(avg_val) if avg_val is not None else 0.0
-    #             else:
-    #                 metrics["orders_last_24h"] = 0
-    #                 metrics["avg_order_value"] = 0.0
-    #         except Exception as e:
-    #             logger.warning(f"Failed to get recent orders metrics: {str(e)}")
-    #             metrics["orders_last_24h"] = 0
-    #             metrics["avg_order_value"] = 0.0
-
-    #         return {
-    #             "success": True,
-    #             "provider": self.connector.get_provider_name(),
-    #             "metrics": metrics,
-    #         }
-
-    #     except Exception as e:
-    #         logger.error(f"Failed to get dashboard metrics: {str(e)}")
-    #         return {
-    #             "error": str(e),
-    #             "provider": self.connector.get_provider_name() if self.connector else "Unknown",
-    #             "metrics": self._get_default_metrics(),
-    #         }
-
-
-   
-    # def get_dashboard_metrics(self) -> Dict[str, Any]:
-    #     """
-    #     Get dashboard metrics for the study webapp
-
-    #     Returns:
-    #         dict: Dashboard metrics or error information
-    #     """
-    #     if not self.connector:
-    #         return {
-    #             "error": "No database connector available",
-    #             "metrics": self._get_default_metrics(),
-    #         }
-
-    #     try:
-    #         # Test connection first
-    #         if not self.connector.test_connection():
-    #             return {
-    #                 "error": "Database connection failed",
-    #                 "metrics": self._get_default_metrics(),
-    #             }
-
-    #         # Try to get basic metrics using simple queries
-    #         metrics = {}
-
-    #         # Get warehouse count
-    #         try:
-    #             result = self.connector.execute_query(
-    #                 "SELECT COUNT(*) as count FROM warehouse"
-    #             )
-    #             if result and "count" in result[0]:
-    #                 warehouse_count = result[0]["count"]
-    #             else:
-    #                 warehouse_count = 0
-                
-    #             metrics["total_warehouses"] = warehouse_count
-    #             # metrics["total_warehouses"] = result[0]["count"] if result else 0
-    #         except Exception as e:
-    #             logger.warning(f"Failed to get warehouse count: {str(e)}")
-    #             metrics["total_warehouses"] = 0
-
-    #         # Get customer count
-    #         try:
-    #             result = self.connector.execute_query(
-    #                 "SELECT COUNT(*) as count FROM customer"
-    #             )
-    #             if result and "count" in result[0]:
-    #                 customer_count = result[0]["count"]
-    #             else:
-    #                 customer_count = 0
-    #             # print("Customer_count: {customer_count}") 
-    #             metrics["total_customers"] = customer_count
-    #         except Exception as e:
-    #             logger.warning(f"Failed to get customer count: {str(e)}")
-    #             metrics["total_customers"] = 0
-
-    #         # Get order count
-    #         try:
-    #             result = self.connector.execute_query(
-    #                 "SELECT COUNT(*) as count FROM orders"
-    #             )
-    #             metrics["total_orders"] = result[0]["count"] if result else 0
-    #         except Exception as e:
-    #             logger.warning(f"Failed to get order count: {str(e)}")
-    #             metrics["total_orders"] = 0
-
-    #         # Get item count
-    #         try:
-    #             result = self.connector.execute_query(
-    #                 "SELECT COUNT(*) as count FROM item"
-    #             )
-    #             metrics["total_items"] = result[0]["count"] if result else 0
-    #         except Exception as e:
-    #             logger.warning(f"Failed to get item count: {str(e)}")
-    #             metrics["total_items"] = 0
-
-    #         return {
-    #             "success": True,
-    #             "provider": self.connector.get_provider_name(),
-    #             "metrics": metrics,
-    #         }
-
-    #     except Exception as e:
-    #         logger.error(f"Failed to get dashboard metrics: {str(e)}")
-    #         return {
-    #             "error": str(e),
-    #             "provider": self.connector.get_provider_name()
-    #             if self.connector
-    #             else "Unknown",
-    #             "metrics": self._get_default_metrics(),
-    #         }
-
     def get_orders(self, limit: int = 10) -> Dict[str, Any]:
         """
         Get recent orders for the study webapp
@@ -504,17 +236,19 @@ class AnalyticsService:
             return {"error": "No database connector available", "orders": []}
 
         try:
-            if not self.connector.test_connection():
-                return {"error": "Database connection failed", "orders": []}
+            limit = int(limit)
+            if limit < 1:
+                raise ValueError(f"limit must be a positive integer, got {limit}")
 
-            query = f"""
+            # Bound LIMIT keeps one statement text, so its prepared plan is reused
+            query = """
                 SELECT o_id, o_w_id, o_d_id, o_c_id, o_entry_d, o_ol_cnt, o_all_local
                 FROM orders 
                 ORDER BY o_entry_d DESC 
-                LIMIT {limit}
+                LIMIT %s
             """
 
-            result = self.connector.execute_query(query)
+            result = self.connector.execute_query(query, (limit,))
 
             return {
                 "success": True,
@@ -546,19 +280,20 @@ class AnalyticsService:
             return {"error": "No database connector available", "inventory": []}
 
         try:
-            if not self.connector.test_connection():
-                return {"error": "Database connection failed", "inventory": []}
+            limit = int(limit)
+            if limit < 1:
+                raise ValueError(f"limit must be a positive integer, got {limit}")
 
-            query = f"""
+            query = """
                 SELECT s.s_i_id, i.i_name, s.s_w_id, s.s_quantity, i.i_price
                 FROM stock s
                 JOIN item i ON s.s_i_id = i.i_id
                 WHERE s.s_quantity < 50
                 ORDER BY s.s_quantity ASC
-                LIMIT {limit}
+                LIMIT %s
             """
 
-            result = self.connector.execute_query(query)
+            result = self.connector.execute_query(query, (limit,))
 
             return {
                 "success": True,
@@ -576,41 +311,40 @@ class AnalyticsService:
                 "inventory": [],
             }
 
-    def _get_default_metrics(self) -> Dict[str, int]:
+    def _get_default_metrics(self) -> Dict[str, Any]:
         """Get default metrics when database is not available"""
-        return {
-            "total_warehouses": 0,
-            "total_customers": 0,
-            "total_orders": 0,
-            "total_items": 0,
-            "new_orders": 0,
-            "low_stock_items": 0,
-            "orders_last_24h": 0,
-            "avg_order_value": 0.0,
-        }
-
-    def get_warehouses(
-        self
-        ) -> Dict[str, Any]:
-        """Get order status for a customer"""
+        return asdict(DashboardMetrics())
+
+    def get_warehouses(self, limit: int = 1000, offset: int = 0) -> Dict[str, Any]:
+        """Get a page of warehouses for the filter dropdowns"""
         try:
-            query ="Select * from Warehouse"
-            result = self.connector.execute_query(query)
+            # Only the columns the dropdowns render; bounded so a large scale
+            # factor cannot pull the whole table into memory
+            query = """
+                SELECT w_id, w_name
+                FROM warehouse
+                ORDER BY w_id
+                LIMIT %s OFFSET %s
+            """
+            result = self.connector.execute_query(query, (int(limit), int(offset)))
             return {"success": True, "warehouses": result}
         except Exception as e:
-            logger.error(f"Order status service error: {str(e)}")
+            logger.error(f"Get warehouses service error: {str(e)}")
             return {"success": False, "error": str(e)}
     
-    def get_districts(
-        self
-        ) -> Dict[str, Any]:
-        """Get order status for a customer"""
+    def get_districts(self, limit: int = 1000, offset: int = 0) -> Dict[str, Any]:
+        """Get a page of districts for the filter dropdowns"""
         try:
-            query ="Select * from District"
-            result = self.connector.execute_query(query)
+            query = """
+                SELECT d_w_id, d_id, d_name
+                FROM district
+                ORDER BY d_w_id, d_id
+                LIMIT %s OFFSET %s
+            """
+            result = self.connector.execute_query(query, (int(limit), int(offset)))
             return {"success": True, "districts": result}
         except Exception as e:
-            logger.error(f"Order status service error: {str(e)}")
+            logger.error(f"Get districts service error: {str(e)}")
             return {"success": False, "error": str(e)}
 
     def close(self):
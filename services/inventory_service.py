@@ -4,7 +4,6 @@ Inventory service for TPC-C operations
 
 import logging
 from typing import Any, Dict, List, Optional
-import psycopg2
 from database.base_connector import BaseDatabaseConnector
 
 logger = logging.getLogger(__name__)
@@ -15,31 +14,46 @@ class InventoryService:
 
     def __init__(self, db_connector: BaseDatabaseConnector):
         self.db = db_connector
-        self.connection = db_connector.connection
+        # District names are effectively immutable; keyed by (w_id, d_id)
+        self._district_cache: Dict[tuple, Optional[str]] = {}
 
     def get_stock_level(self, warehouse_id: int, district_id: int, threshold: int):
         """
         Fetch stock level for a given warehouse/district with threshold.
-        Returns a list of items below threshold quantity.
+        Returns the number of distinct recently ordered items below threshold quantity.
         """
         try:
-            with self.connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-                query = """
-                    SELECT s_i_id, s_quantity
-                    FROM stock
-                    WHERE s_w_id = %s
-                      AND s_quantity < %s
-                      AND s_i_id IN (
-                          SELECT ol_i_id
-                          FROM order_line
-                          WHERE ol_w_id = %s
-                            AND ol_d_id = %s
-                      )
-                """
-                cursor.execute(query, (warehouse_id, threshold, warehouse_id, district_id))
-                results = cursor.fetchall()
-                print(f"Stock level : {results}")
-                return {"success": True, "data": results}
+            # EXISTS lets the planner pick a hash semi-join instead of
+            # re-evaluating the order_line subquery per stock row.
+            # Per TPC-C 2.8 only the district's last 20 orders are examined,
+            # which keeps the probe on the (ol_w_id, ol_d_id, ol_o_id) PK prefix.
+            query = """
+                WITH n AS (
+                    SELECT d_next_o_id
+                    FROM district
+                    WHERE d_w_id = %s AND d_id = %s
+                )
+                SELECT COUNT(DISTINCT s.s_i_id) AS low_stock_count
+                FROM stock s
+                WHERE s.s_w_id = %s
+                  AND s.s_quantity < %s
+                  AND EXISTS (
+                      SELECT 1
+                      FROM order_line ol
+                      WHERE ol.ol_w_id = s.s_w_id
+                        AND ol.ol_d_id = %s
+                        AND ol.ol_i_id = s.s_i_id
+                        AND ol.ol_o_id >= (SELECT d_next_o_id - 20 FROM n)
+                        AND ol.ol_o_id < (SELECT d_next_o_id FROM n)
+                  )
+            """
+            result = self.db.fetch_one(
+                query,
+                (warehouse_id, district_id, warehouse_id, threshold, district_id),
+            )
+            low_stock_count = result["low_stock_count"]
+            logger.debug("stock_level low_stock_count=%d", low_stock_count)
+            return {"success": True, "low_stock_count": low_stock_count}
         except Exception as e:
             logger.error(f"Database error in get_stock_level: {str(e)}")
             return {"success": False, "error": str(e)}
@@ -69,7 +83,15 @@ class InventoryService:
             offset=0
         ):
         try:
-            query = """
+            # Column list is covered by idx_stock_cover / idx_item_cover
+            # (database/migrations/001) so this can run as an index-only scan
+            where_clause = """
+                WHERE (%(warehouse_id)s IS NULL OR s.s_w_id = %(warehouse_id)s)
+                AND (%(item_search)s IS NULL OR i.i_name ILIKE %(item_search_like)s)
+            """
+            # Ordered by the stock primary key so OFFSET pages are stable; one
+            # extra row tells whether a next page exists without counting
+            query = f"""
                 SELECT  s.s_i_id,
                     s.s_w_id,
                     s.s_quantity,
@@ -80,26 +102,39 @@ class InventoryService:
                     i.i_price AS i_price
                 FROM stock s
                 JOIN item i ON i.i_id = s.s_i_id
-                WHERE (%(warehouse_id)s IS NULL OR s.s_w_id = %(warehouse_id)s)
-                AND (%(item_search)s IS NULL OR i.i_name ILIKE %(item_search_like)s)
+                {where_clause}
+                ORDER BY s.s_w_id, s.s_i_id
                 LIMIT %(limit)s OFFSET %(offset)s
             """
-            params = {
+            filter_params = {
                 "warehouse_id": warehouse_id,
-                "low_stock_threshold": low_stock_threshold,
                 "item_search": item_search,
                 "item_search_like": f"%{item_search}%" if item_search else None,
-                "limit": limit,
-                "offset": offset
             }
-            rows = self.db.fetch_all(query, params)
+            rows = self.db.execute_query(
+                query, {**filter_params, "limit": limit + 1, "offset": offset}
+            )
+            inventory = rows[:limit]
+            has_next = len(rows) > limit
+
+            # The total is only shown as "x of N"; the cached count keeps
+            # paging from rescanning the whole filtered join on every page
+            total_count = self.db.cached_count(
+                f"""
+                SELECT COUNT(*) AS total
+                FROM stock s
+                JOIN item i ON i.i_id = s.s_i_id
+                {where_clause}
+                """,
+                filter_params,
+            )
 
             return {
-                "inventory": rows,
-                "total_count": len(rows),
+                "inventory": inventory,
+                "total_count": total_count,
                 "limit": limit,
                 "offset": offset,
-                "has_next": len(rows) == limit,
+                "has_next": has_next,
                 "has_prev": offset > 0
             }
         except Exception as e:
@@ -123,65 +158,52 @@ class InventoryService:
     ) -> List[Dict[str, Any]]:
         """Get items with low stock levels, optionally filtered by warehouse and district."""
         try:
+            filter_district = district_id is not None and warehouse_id is not None
+
             # Step 1: Base Query
             query = """
-                SELECT 
+                SELECT
                     s.s_i_id, s.s_w_id, s.s_quantity, s.s_ytd, s.s_order_cnt,
                     i.i_name, i.i_price, i.i_data,
                     w.w_name
                 FROM stock s
                 JOIN item i ON i.i_id = s.s_i_id
                 JOIN warehouse w ON w.w_id = s.s_w_id
-                WHERE s.s_quantity < %s
             """
-            params = [threshold]
+            params = []
+
+            # Step 2: Optional District Filtering, matched set-wise against the
+            # s_dist_* columns. LEFT JOIN keeps the unfiltered fallback when the
+            # district does not exist.
+            if filter_district:
+                query += """
+                LEFT JOIN district d ON d.d_w_id = s.s_w_id AND d.d_id = %s
+                """
+                params.append(district_id)
+
+            query += " WHERE s.s_quantity < %s"
+            params.append(threshold)
 
             if warehouse_id:
                 query += " AND s.s_w_id = %s"
                 params.append(warehouse_id)
 
-            query += " ORDER BY s.s_quantity ASC LIMIT %s"
-            params.append(limit)
-
-            items = self.db.execute_query(query, tuple(params))
-
-            # Step 2: Optional District Filtering
-            if district_id is not None and warehouse_id is not None:
-                # Get district name
-                district_query = """
-                    SELECT d_name FROM district
-                    WHERE d_id = %s AND d_w_id = %s
+            if filter_district:
+                query += """
+                AND (
+                    d.d_id IS NULL
+                    OR d.d_name = ANY (ARRAY[
+                        s.s_dist_01, s.s_dist_02, s.s_dist_03, s.s_dist_04,
+                        s.s_dist_05, s.s_dist_06, s.s_dist_07, s.s_dist_08,
+                        s.s_dist_09, s.s_dist_10
+                    ])
+                )
                 """
-                district_data = self.db.execute_query(district_query, (district_id, warehouse_id))
 
-                if district_data:
-                    district_name = district_data[0]["d_name"]
-
-                    # Step 3: Filter items based on district name match
-                    filtered_items = []
-                    for item in items:
-                        dist_query = """
-                            SELECT s_dist_01, s_dist_02, s_dist_03, s_dist_04,
-                                s_dist_05, s_dist_06, s_dist_07, s_dist_08,
-                                s_dist_09, s_dist_10
-                            FROM stock
-                            WHERE s_i_id = %s AND s_w_id = %s
-                        """
-                        dist_data = self.db.execute_query(
-                            dist_query, (item["s_i_id"], item["s_w_id"])
-                        )
-
-                        if dist_data:
-                            dist_values = list(dist_data[0].values())
-                            if district_name in dist_values:
-                                filtered_items.append(item)
-
-                    return filtered_items
-
-                # If no district name found, fall back to unfiltered items
-                logger.warning(f"No district found for ID {district_id} in warehouse {warehouse_id}, skipping district filter.")
+            query += " ORDER BY s.s_quantity ASC LIMIT %s"
+            params.append(limit)
 
-            return items
+            return self.db.execute_query(query, tuple(params))
 
         except Exception as e:
             logger.error(f"Get low stock items service error: {str(e)}")
@@ -191,16 +213,34 @@ class InventoryService:
     def get_item_details(self, item_id: int) -> Dict[str, Any]:
         """Get detailed information about a specific item"""
         try:
-            # Get item information
+            # Item aggregates and per-warehouse stock in one round-trip;
+            # psycopg2 decodes the json_agg column straight into a list of dicts
             item_query = """
                 SELECT i.*, COUNT(s.s_w_id) as warehouse_count,
                        AVG(s.s_quantity) as avg_stock,
                        MIN(s.s_quantity) as min_stock,
                        MAX(s.s_quantity) as max_stock,
                        SUM(s.s_ytd) as total_ytd,
-                       SUM(s.s_order_cnt) as total_orders
+                       SUM(s.s_order_cnt) as total_orders,
+                       COALESCE(
+                           json_agg(
+                               json_build_object(
+                                   's_w_id', s.s_w_id,
+                                   's_quantity', s.s_quantity,
+                                   's_ytd', s.s_ytd,
+                                   's_order_cnt', s.s_order_cnt,
+                                   's_remote_cnt', s.s_remote_cnt,
+                                   'w_name', w.w_name,
+                                   'w_city', w.w_city,
+                                   'w_state', w.w_state
+                               )
+                               ORDER BY s.s_w_id
+                           ) FILTER (WHERE s.s_w_id IS NOT NULL),
+                           '[]'
+                       ) as stock_by_warehouse
                 FROM item i
                 LEFT JOIN stock s ON s.s_i_id = i.i_id
+                LEFT JOIN warehouse w ON w.w_id = s.s_w_id
                 WHERE i.i_id = %s
                 GROUP BY i.i_id, i.i_im_id, i.i_name, i.i_price, i.i_data
             """
@@ -211,18 +251,7 @@ class InventoryService:
                 return {"success": False, "error": "Item not found"}
 
             item = item_result[0]
-
-            # Get stock by warehouse
-            stock_query = """
-                SELECT s.s_w_id, s.s_quantity, s.s_ytd, s.s_order_cnt, s.s_remote_cnt,
-                       w.w_name, w.w_city, w.w_state
-                FROM stock s
-                JOIN warehouse w ON w.w_id = s.s_w_id
-                WHERE s.s_i_id = %s
-                ORDER BY s.s_w_id
-            """
-
-            stock_by_warehouse = self.db.execute_query(stock_query, (item_id,))
+            stock_by_warehouse = item.pop("stock_by_warehouse")
 
             return {
                 "success": True,
@@ -248,63 +277,31 @@ class InventoryService:
             if warehouse_id:
                 where_clause += " AND s_w_id = %s"
                 params.append(warehouse_id)
-
-            # Total items in stock
-            total_query = f"SELECT COUNT(*) as count FROM stock {where_clause}"
-            total_result = self.db.execute_query(total_query, tuple(params))
-            stats["total_stock_records"] = (
-                total_result[0]["count"] if total_result else 0
-            )
-
-            # Low stock items (< 10)
-            low_stock_query = f"""
-                SELECT COUNT(*) as count 
-                FROM stock 
-                {where_clause} AND s_quantity < 10
-            """
-            low_stock_result = self.db.execute_query(low_stock_query, tuple(params))
-            stats["low_stock_items"] = (
-                low_stock_result[0]["count"] if low_stock_result else 0
-            )
-
-            # Out of stock items (= 0)
-            out_of_stock_query = f"""
-                SELECT COUNT(*) as count 
-                FROM stock 
-                {where_clause} AND s_quantity = 0
-            """
-            out_of_stock_result = self.db.execute_query(
-                out_of_stock_query, tuple(params)
-            )
-            stats["out_of_stock_items"] = (
-                out_of_stock_result[0]["count"] if out_of_stock_result else 0
-            )
-
-            # Average stock quantity
-            avg_stock_query = f"""
-                SELECT AVG(s_quantity) as avg_quantity 
-                FROM stock 
+            params = tuple(params)
+
+            # Counts, average and value in a single pass over stock
+            summary_query = f"""
+                SELECT
+                    COUNT(*) as total_count,
+                    COUNT(*) FILTER (WHERE s.s_quantity < 10) as low_stock_count,
+                    COUNT(*) FILTER (WHERE s.s_quantity = 0) as out_of_stock_count,
+                    AVG(s.s_quantity) as avg_quantity,
+                    SUM(s.s_quantity * i.i_price) as total_value
+                FROM stock s
+                LEFT JOIN item i ON i.i_id = s.s_i_id
                 {where_clause}
             """
-            avg_stock_result = self.db.execute_query(avg_stock_query, tuple(params))
+            summary_result = self.db.execute_query(summary_query, params)
+            summary = summary_result[0] if summary_result else {}
+
+            stats["total_stock_records"] = summary.get("total_count") or 0
+            stats["low_stock_items"] = summary.get("low_stock_count") or 0
+            stats["out_of_stock_items"] = summary.get("out_of_stock_count") or 0
             stats["avg_stock_quantity"] = (
-                float(avg_stock_result[0]["avg_quantity"])
-                if avg_stock_result and avg_stock_result[0]["avg_quantity"]
-                else 0.0
+                float(summary["avg_quantity"]) if summary.get("avg_quantity") else 0.0
             )
-
-            # Total inventory value (approximate)
-            value_query = f"""
-                SELECT SUM(s.s_quantity * i.i_price) as total_value
-                FROM stock s
-                JOIN item i ON i.i_id = s.s_i_id
-                {where_clause}
-            """
-            value_result = self.db.execute_query(value_query, tuple(params))
             stats["total_inventory_value"] = (
-                float(value_result[0]["total_value"])
-                if value_result and value_result[0]["total_value"]
-                else 0.0
+                float(summary["total_value"]) if summary.get("total_value") else 0.0
             )
 
             # Most ordered items
@@ -316,7 +313,7 @@ class InventoryService:
                 ORDER BY s.s_order_cnt DESC
                 LIMIT 5
             """
-            top_items_result = self.db.execute_query(top_items_query, tuple(params))
+            top_items_result = self.db.execute_query(top_items_query, params)
             stats["top_ordered_items"] = top_items_result
 
             return stats
@@ -396,16 +393,21 @@ class InventoryService:
 
     def get_district_name(self, warehouse_id: int, district_id: int) -> Optional[str]:
         """Get the district name based on warehouse ID and district ID."""
+        key = (warehouse_id, district_id)
+        if key in self._district_cache:
+            return self._district_cache[key]
         try:
             query = """
                 SELECT d_name FROM district
                 WHERE d_w_id = %s AND d_id = %s
                 LIMIT 1
             """
-            result = self.db.execute_query(query, (warehouse_id, district_id))
-            if result:
-                return result[0]["d_name"]
-            return None
+            with self.db.cursor() as cur:
+                cur.execute(query, (warehouse_id, district_id))
+                row = cur.fetchone()
+            name = row[0] if row else None
+            self._district_cache[key] = name
+            return name
         except Exception as e:
             logger.error(f"Error fetching district name: {str(e)}")
             return None
\ No newline at end of file
@@ -7,10 +7,20 @@ import os
 from typing import Any, Dict, List, Optional
 
 from database.base_connector import BaseDatabaseConnector
-from datetime import datetime
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_OL_DIST_INFO = "DEFAULT DIST INFO".ljust(24)[:24]
+
+# TPC-C allows 5-15 lines per order; larger requests are rejected up front
+MAX_ORDER_LINES = 15
+
+# Run new orders through the tpcc_new_order function (migration 004)
+NEW_ORDER_USE_TXN_FUNCTION = (
+    os.getenv("NEW_ORDER_USE_TXN_FUNCTION", "false").lower() == "true"
+)
+
 
 class OrderService:
     """Service class for order-related operations"""
@@ -24,76 +34,91 @@ class OrderService:
         self.region_name = region_name or os.environ.get("REGION_NAME")
 
 
+    # One statement delivers the oldest undelivered order of every district:
+    # the data-modifying CTEs run atomically, replacing five round-trips per
+    # district. The order is popped from new_order by primary key, and SKIP
+    # LOCKED lets concurrent deliveries take different orders. Orders placed
+    # before new_order was populated need migrations/010_new_order_backfill.sql.
+    _DELIVERY_QUERY = """
+        WITH oldest AS (
+            SELECT d.d_id, no.no_o_id AS o_id
+            FROM generate_series(1, 10) AS d (d_id)
+            CROSS JOIN LATERAL (
+                SELECT no_o_id
+                FROM new_order
+                WHERE no_w_id = %(warehouse_id)s
+                AND no_d_id = d.d_id
+                ORDER BY no_o_id ASC
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            ) no
+        ),
+        del_new_order AS (
+            DELETE FROM new_order
+            USING oldest
+            WHERE no_w_id = %(warehouse_id)s
+            AND no_d_id = oldest.d_id
+            AND no_o_id = oldest.o_id
+        ),
+        upd_orders AS (
+            UPDATE orders
+            SET o_carrier_id = %(carrier_id)s
+            FROM oldest
+            WHERE o_w_id = %(warehouse_id)s
+            AND o_d_id = oldest.d_id
+            AND o_id = oldest.o_id
+            RETURNING o_d_id, o_id, o_c_id
+        ),
+        upd_lines AS (
+            UPDATE order_line
+            SET ol_delivery_d = CURRENT_TIMESTAMP
+            FROM oldest
+            WHERE ol_w_id = %(warehouse_id)s
+            AND ol_d_id = oldest.d_id
+            AND ol_o_id = oldest.o_id
+            RETURNING ol_d_id, ol_amount
+        ),
+        totals AS (
+            SELECT upd_orders.o_d_id AS d_id, upd_orders.o_id, upd_orders.o_c_id,
+                   COALESCE(SUM(upd_lines.ol_amount), 0) AS amount
+            FROM upd_orders
+            LEFT JOIN upd_lines ON upd_lines.ol_d_id = upd_orders.o_d_id
+            GROUP BY upd_orders.o_d_id, upd_orders.o_id, upd_orders.o_c_id
+        ),
+        upd_customers AS (
+            UPDATE customer
+            SET c_balance = c_balance + totals.amount,
+                c_delivery_cnt = c_delivery_cnt + 1
+            FROM totals
+            WHERE c_w_id = %(warehouse_id)s
+            AND c_d_id = totals.d_id
+            AND c_id = totals.o_c_id
+        )
+        SELECT o_id AS order_id, o_c_id AS customer_id, d_id AS district_id, amount
+        FROM totals
+        ORDER BY d_id
+    """
+
     def execute_delivery(self, warehouse_id: int, carrier_id: int):
         """
         Executes the TPC-C delivery transaction for a warehouse.
         - warehouse_id: Warehouse ID
         - carrier_id: Carrier ID (1–10)
         """
-        delivered_orders = []
-
-        for _ in range(1, 11):  
-            orders = self.db.execute_query("""
-                SELECT o_id, o_c_id, o_d_id
-                FROM orders
-                WHERE o_w_id = %s
-                AND o_carrier_id IS NULL
-                ORDER BY o_id ASC
-                LIMIT 1
-            """, (warehouse_id,))
-
-            if not orders:
-                continue  
-
-            order_id = orders[0]['o_id']
-            customer_id = orders[0]['o_c_id']
-            district_id = orders[0]['o_d_id']
-
-            self.db.execute_query("""
-                UPDATE orders
-                SET o_carrier_id = %s
-                WHERE o_w_id = %s
-                AND o_d_id = %s
-                AND o_id = %s
-            """, (carrier_id, warehouse_id, district_id, order_id))
-
-            self.db.execute_query("""
-                UPDATE order_line
-                SET ol_delivery_d = CURRENT_TIMESTAMP
-                WHERE ol_w_id = %s
-                AND ol_d_id = %s
-                AND ol_o_id = %s
-            """, (warehouse_id, district_id, order_id))
-
-            total_amount_result = self.db.execute_query("""
-                SELECT SUM(ol_amount) AS total_amount
-                FROM order_line
-                WHERE ol_w_id = %s
-                AND ol_d_id = %s
-                AND ol_o_id = %s
-            """, (warehouse_id, district_id, order_id))
-
-            total_amount = total_amount_result[0]['total_amount'] if total_amount_result else 0
-
-            self.db.execute_query("""
-                UPDATE customer
-                SET c_balance = c_balance + %s,
-                    c_delivery_cnt = c_delivery_cnt + 1
-                WHERE c_w_id = %s
-                AND c_d_id = %s
-                AND c_id = %s
-            """, (total_amount, warehouse_id, district_id, customer_id))
-
-            delivered_orders.append({
-                "order_id": order_id,
-                "customer_id": customer_id,
-                "district_id": district_id,
-                "amount": float(total_amount) if total_amount else 0.0
-            })
-
-        self.db.connection.commit()
-
-        return delivered_orders
+        delivered = self.db.execute_query(
+            self._DELIVERY_QUERY,
+            {"warehouse_id": warehouse_id, "carrier_id": carrier_id},
+        )
+
+        return [
+            {
+                "order_id": row["order_id"],
+                "customer_id": row["customer_id"],
+                "district_id": row["district_id"],
+                "amount": float(row["amount"]) if row["amount"] else 0.0
+            }
+            for row in delivered
+        ]
 
 
     def execute_new_order(
@@ -109,6 +134,14 @@ class OrderService:
         2. Insert order_lines for each item
         3. Mark order as multi-region if items come from different warehouses
         """
+        if not items:
+            return {"success": False, "error": "No items"}
+        if len(items) > MAX_ORDER_LINES:
+            return {
+                "success": False,
+                "error": f"Too many items: {len(items)} (max {MAX_ORDER_LINES})",
+            }
+
         try:
             logger.info(
                 f"🛒 Creating new order: warehouse_id={warehouse_id}, district_id={district_id}, "
@@ -116,89 +149,41 @@ class OrderService:
             )
             region_created = os.getenv("REGION_NAME")  
  
-            for idx, item in enumerate(items, 1):
-                if "i_id" not in item or "quantity" not in item:
-                    raise ValueError(f"Item {idx} is missing required fields: {item}")
-                logger.info(f"📦 Item {idx}: {item}")
-
             warehouse_id = int(warehouse_id)
             district_id = int(district_id)
 
-            for item in items:
-                item['warehouse_id'] = int(item.get('warehouse_id', warehouse_id))
-
-            local_items = sum(
-                1 for item in items if item.get("warehouse_id", warehouse_id) == warehouse_id
-            )
+            # One pass validates, normalizes to (i_id, quantity, supply_w_id)
+            # and counts local lines
+            missing = []
+            normalized = []
+            local_items = 0
+            for idx, item in enumerate(items, 1):
+                if "i_id" not in item or "quantity" not in item:
+                    missing.append(idx)
+                    continue
+                supply_w_id = int(item.get("warehouse_id", warehouse_id))
+                if supply_w_id == warehouse_id:
+                    local_items += 1
+                normalized.append((int(item["i_id"]), int(item["quantity"]), supply_w_id))
+            if missing:
+                raise ValueError(f"Items missing required fields at positions: {missing}")
             all_local = 1 if local_items == len(items) else 0
-            
-            order_id_result = self.db.execute_query("""
-                    SELECT COALESCE(MAX(o_id), 0) + 1 AS next_order_id
-                    FROM orders
-                """)
-            if not order_id_result:
-                raise RuntimeError("Failed to fetch new order id")
-
-            if isinstance(order_id_result[0], dict):
-                order_id = order_id_result[0]["next_order_id"]
 
-            else:
-                order_id = order_id_result[0][0]
-
-
-            order_entry_d = datetime.utcnow()
-            self.db.execute_query(
-                """
-                INSERT INTO orders (
-                    o_id, o_d_id, o_w_id, o_c_id,
-                    o_entry_d, o_carrier_id, o_ol_cnt, o_all_local,region_created
-                ) VALUES (%s, %s, %s, %s, %s, NULL, %s, %s,%s)
-                """,
-                (
-                    order_id,
-                    district_id,
+            if NEW_ORDER_USE_TXN_FUNCTION:
+                # Whole transaction server-side in one round-trip (migration 004)
+                order_id = self.db.call_txn(
+                    "tpcc_new_order",
                     warehouse_id,
+                    district_id,
                     customer_id,
-                    order_entry_d,
-                    len(items),
-                    all_local,
-                    region_created
-                ),
-            )
-
-            for line_number, item in enumerate(items, 1):
-                item_id = item["i_id"]
-                quantity = item["quantity"]
-                supply_w_id = item.get("warehouse_id", warehouse_id)
-
-                price_result = self.db.fetch_one(
-                    "SELECT i_price FROM item WHERE i_id = %s", (item_id,)
-                )
-                if not price_result or "i_price" not in price_result:
-                    raise RuntimeError(f"Item price not found for item_id {item_id}")
-                item_price = price_result["i_price"]
-
-                amount = quantity * item_price
-                ol_dist_info = "DEFAULT DIST INFO".ljust(24)[:24]  
-
-                self.db.execute_query(
-                    """
-                    INSERT INTO order_line (
-                        ol_o_id, ol_d_id, ol_w_id, ol_number,
-                        ol_i_id, ol_supply_w_id, ol_quantity, ol_amount, ol_delivery_d, ol_dist_info
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NULL, %s)
-                    """,
-                    (
-                        order_id,
-                        district_id,
-                        warehouse_id,
-                        line_number,
-                        item_id,
-                        supply_w_id,
-                        quantity,
-                        amount,
-                        ol_dist_info,
-                    ),
+                    [item_id for item_id, _, _ in normalized],
+                    [supply_w_id for _, _, supply_w_id in normalized],
+                    [quantity for _, quantity, _ in normalized],
+                    region_created,
+                )[0]["order_id"]
+            else:
+                order_id = self._insert_order(
+                    warehouse_id, district_id, customer_id, normalized, all_local, region_created
                 )
 
             logger.info(f"✅ Order {order_id} created successfully")
@@ -219,57 +204,185 @@ class OrderService:
             logger.error(f"❌ New order service error: {error_message}\n{traceback.format_exc()}")
             return {"success": False, "error": error_message}
 
-    def get_orders(self, warehouse_id=None, district_id=None, customer_id=None, status=None, limit=50, offset=0):
+    def _insert_order(
+        self, warehouse_id, district_id, customer_id, normalized, all_local, region_created
+    ) -> int:
+        """Write the order, its new_order entry and its lines; returns the order id"""
+        # Prices come from one IN query, resolved before anything is written
+        # so a bad item id leaves no order behind
+        prices = self._item_prices({item_id for item_id, _, _ in normalized})
+        for item_id, _, _ in normalized:
+            if item_id not in prices:
+                raise RuntimeError(f"Item price not found for item_id {item_id}")
+
+        # Allocate the order id from the district counter and write the order,
+        # its new_order entry and its lines in one statement, so they commit
+        # or fail together. The UPDATE holds the district row lock, so
+        # concurrent new orders never collide. The counter must already be past
+        # existing orders (migrations/008_district_next_order_id_sync.sql)
+        order_entry_d = datetime.now(timezone.utc)
+        order_id_result = self.db.execute_query(
+            """
+            WITH next_id AS (
+                UPDATE district
+                SET d_next_o_id = d_next_o_id + 1
+                WHERE d_w_id = %s AND d_id = %s
+                RETURNING d_next_o_id - 1 AS o_id
+            ),
+            new_orders AS (
+                INSERT INTO orders (
+                    o_id, o_d_id, o_w_id, o_c_id,
+                    o_entry_d, o_carrier_id, o_ol_cnt, o_all_local,region_created
+                )
+                SELECT o_id, %s::int, %s::int, %s::int, %s::timestamptz, NULL, %s::int, %s::int, %s::varchar
+                FROM next_id
+                RETURNING o_id, o_d_id, o_w_id
+            ),
+            queued AS (
+                INSERT INTO new_order (no_o_id, no_d_id, no_w_id)
+                SELECT o_id, o_d_id, o_w_id
+                FROM new_orders
+            ),
+            lines AS (
+                INSERT INTO order_line (
+                    ol_o_id, ol_d_id, ol_w_id, ol_number,
+                    ol_i_id, ol_supply_w_id, ol_quantity, ol_amount, ol_delivery_d, ol_dist_info
+                )
+                SELECT o.o_id, o.o_d_id, o.o_w_id, l.n,
+                       l.i_id, l.supply_w_id, l.qty, l.amount, NULL, %s::varchar
+                FROM new_orders o
+                CROSS JOIN unnest(%s::int[], %s::int[], %s::int[], %s::numeric[])
+                    WITH ORDINALITY AS l (i_id, supply_w_id, qty, amount, n)
+            )
+            SELECT o_id FROM new_orders
+            """,
+            (
+                warehouse_id,
+                district_id,
+                district_id,
+                warehouse_id,
+                customer_id,
+                order_entry_d,
+                len(normalized),
+                all_local,
+                region_created,
+                _DEFAULT_OL_DIST_INFO,
+                [item_id for item_id, _, _ in normalized],
+                [supply_w_id for _, _, supply_w_id in normalized],
+                [quantity for _, quantity, _ in normalized],
+                [quantity * prices[item_id] for item_id, quantity, _ in normalized],
+            ),
+        )
+        if not order_id_result:
+            raise RuntimeError(
+                f"District {district_id} not found for warehouse {warehouse_id}"
+            )
+        order_id = order_id_result[0]["o_id"]
+
+        return order_id
+
+    def _item_prices(self, item_ids) -> Dict[int, Any]:
+        """Return {i_id: i_price} for item_ids.
+
+        item is in the connector's TTL result cache (NEON_RESULT_CACHE_TABLES),
+        so a repeated item set is served from memory and price updates made
+        through the connector are seen; ids are sorted so equal sets share a key.
+        """
+        rows = self.db.execute_query(
+            "SELECT i_id, i_price FROM item WHERE i_id IN %s", (tuple(sorted(item_ids)),)
+        )
+        return {row["i_id"]: row["i_price"] for row in rows}
+
+    def get_orders(
+        self,
+        warehouse_id=None,
+        district_id=None,
+        customer_id=None,
+        status=None,
+        limit=50,
+        offset=0,
+        after_date: Optional[datetime] = None,
+        after_key: Optional[tuple] = None,
+    ):
+        """Fetch filtered orders, newest first.
+
+        When after_date/after_key (o_entry_d and (o_w_id, o_d_id, o_id) of the
+        last row on the previous page) are given, the page is located with a
+        keyset seek instead of OFFSET, so fetching a deep page costs O(limit).
+        The total comes from a separate COUNT that cached_count reuses per
+        filter, so paging does not rescan the filtered set every time.
+        """
         try:
-            query = """
-                SELECT *,
+            keyset = after_date is not None and after_key is not None
+            where_clause = """
+                WHERE (%(warehouse_id)s IS NULL OR o_w_id = %(warehouse_id)s)
+                AND (%(district_id)s IS NULL OR o_d_id = %(district_id)s)
+                AND (%(customer_id)s IS NULL OR o_c_id = %(customer_id)s)
+                AND (
+                        %(status)s IS NULL
+                        OR (%(status)s = 'New'   AND o_carrier_id IS NULL)
+                        OR (%(status)s = 'Delivered' AND o_carrier_id IS NOT NULL)
+                    )
+            """
+            seek_clause = ""
+            if keyset:
+                seek_clause = """
+                    AND (o_entry_d, o_w_id, o_d_id, o_id)
+                        < (%(after_date)s, %(after_w_id)s, %(after_d_id)s, %(after_id)s)
+                """
+            query = f"""
+                SELECT o_id, o_w_id, o_d_id, o_c_id, o_entry_d,
+                        o_carrier_id, o_ol_cnt, o_all_local,
                         CASE 
                             WHEN o_carrier_id IS NULL THEN 'New'
                             ELSE 'Delivered'
                         END AS status
                     FROM orders
-                    WHERE (%(warehouse_id)s IS NULL OR o_w_id = %(warehouse_id)s)
-                    AND (%(district_id)s IS NULL OR o_d_id = %(district_id)s)
-                    AND (%(customer_id)s IS NULL OR o_c_id = %(customer_id)s)
-                    AND (
-                            %(status)s IS NULL
-                            OR (%(status)s = 'New'   AND o_carrier_id IS NULL)
-                            OR (%(status)s = 'Delivered' AND o_carrier_id IS NOT NULL)
-                        )
-                    ORDER BY o_entry_d DESC
+                    {where_clause}
+                    {seek_clause}
+                    ORDER BY o_entry_d DESC, o_w_id DESC, o_d_id DESC, o_id DESC
                     LIMIT %(limit)s OFFSET %(offset)s
             """
-            params = {
+            after_w_id, after_d_id, after_id = after_key if keyset else (None, None, None)
+            filter_params = {
                 "warehouse_id": warehouse_id,
                 "district_id": district_id,
                 "customer_id": customer_id,
                 "status": status,
-                "limit": limit,
-                "offset": offset,
+            }
+            params = {
+                **filter_params,
+                # One extra row tells whether a next page exists
+                "limit": limit + 1,
+                "offset": 0 if keyset else offset,
+                "after_date": after_date,
+                "after_w_id": after_w_id,
+                "after_d_id": after_d_id,
+                "after_id": after_id,
             }
 
-            with self.db.cursor(dictionary=True) as cursor:
-                cursor.execute(query, params)
-                orders = cursor.fetchall()
+            rows = self.db.execute_query(query, params)
+            orders = rows[:limit]
+            has_next = len(rows) > limit
+            total_count = self.db.cached_count(
+                f"SELECT COUNT(*) AS total FROM orders {where_clause}", filter_params
+            )
 
-            count_query = """
-                SELECT COUNT(*) AS total
-                FROM orders
-                WHERE (%(warehouse_id)s IS NULL OR o_w_id = %(warehouse_id)s)
-                AND (%(district_id)s IS NULL OR o_d_id = %(district_id)s)
-                AND (%(customer_id)s IS NULL OR o_c_id = %(customer_id)s)
-                AND (%(status)s IS NULL OR 
-                    (%(status)s = 'New' AND o_carrier_id IS NULL) OR
-                    (%(status)s = 'Delivered' AND o_carrier_id IS NOT NULL))
-            """
-            with self.db.cursor(dictionary=True) as cursor:
-                cursor.execute(count_query, params)
-                total_count = cursor.fetchone()["total"]
+            next_cursor = None
+            if has_next:
+                last = orders[-1]
+                next_cursor = {
+                    "after_date": last["o_entry_d"],
+                    "after_w_id": last["o_w_id"],
+                    "after_d_id": last["o_d_id"],
+                    "after_id": last["o_id"],
+                }
             return {
                 "orders": orders,
                 "total_count": total_count,
                 "has_prev": offset > 0,
-                "has_next": offset + limit < total_count
+                "has_next": has_next,
+                "next_cursor": next_cursor,
             }
 
         except Exception as e:
@@ -314,40 +427,42 @@ class OrderService:
     ) -> Dict[str, Any]:
         """Get detailed information about a specific order"""
         try:
-            # Get order information
+            # Order header and lines are independent reads; fetch them concurrently
             order_query = """
-                SELECT o.*, c.c_first, c.c_middle, c.c_last,
-                       CASE WHEN no.no_o_id IS NOT NULL THEN 'New' ELSE 'Delivered' END as status
+                SELECT o.o_id, o.o_w_id, o.o_d_id, o.o_c_id, o.o_entry_d,
+                       o.o_carrier_id, o.o_ol_cnt, o.o_all_local,
+                       c.c_first, c.c_middle, c.c_last,
+                       CASE WHEN no.no_o_id IS NOT NULL THEN 'New' ELSE 'Delivered' END as status,
+                       (SELECT SUM(ol_amount) FROM order_line
+                        WHERE ol_w_id = o.o_w_id AND ol_d_id = o.o_d_id AND ol_o_id = o.o_id) AS total_amount
                 FROM orders o
                 JOIN customer c ON c.c_w_id = o.o_w_id AND c.c_d_id = o.o_d_id AND c.c_id = o.o_c_id
                 LEFT JOIN new_order no ON no.no_w_id = o.o_w_id AND no.no_d_id = o.o_d_id AND no.no_o_id = o.o_id
                 WHERE o.o_w_id = %s AND o.o_d_id = %s AND o.o_id = %s
             """
 
-            order_result = self.db.execute_query(
-                order_query, (warehouse_id, district_id, order_id)
-            )
-
-            if not order_result:
-                return {"success": False, "error": "Order not found"}
-
-            order = order_result[0]
-
-            # Get order lines
             order_lines_query = """
-                SELECT ol.*, i.i_name, i.i_price
+                SELECT ol.ol_number, ol.ol_i_id, ol.ol_supply_w_id, ol.ol_quantity,
+                       ol.ol_amount, ol.ol_delivery_d, i.i_name, i.i_price
                 FROM order_line ol
                 JOIN item i ON i.i_id = ol.ol_i_id
                 WHERE ol.ol_w_id = %s AND ol.ol_d_id = %s AND ol.ol_o_id = %s
                 ORDER BY ol.ol_number
             """
 
-            order_lines = self.db.execute_query(
-                order_lines_query, (warehouse_id, district_id, order_id)
+            key = (warehouse_id, district_id, order_id)
+            order_result, order_lines = self.db.gather_reads(
+                [(order_query, key), (order_lines_query, key)]
             )
 
-            # Calculate total amount
-            total_amount = sum(float(line.get("ol_amount", 0)) for line in order_lines)
+            if not order_result:
+                return {"success": False, "error": "Order not found"}
+
+            order = order_result[0]
+
+            # Summed by the database alongside the header
+            total_amount = order.pop("total_amount")
+            total_amount = float(total_amount) if total_amount else 0.0
 
             return {
                 "success": True,
@@ -376,76 +491,52 @@ class OrderService:
                 LIMIT %s
             """
 
-            return self.db.execute_query(query, (limit,))
+            # Walks idx_orders_entry_d_key (migration 009) in order and stops after
+            # limit rows; the joins are primary-key lookups per order
+            return self.db.execute_query(query, (int(limit),))
 
         except Exception as e:
             logger.error(f"Get recent orders service error: {str(e)}")
             return []
 
+    # All figures in one pass over orders; built once per variant so each call
+    # reuses identical SQL text (and its prepared statement)
+    _STATS_QUERY = """
+        SELECT COUNT(*) AS total_orders,
+               COUNT(no.no_o_id) AS new_orders,
+               COUNT(*) FILTER (WHERE DATE(o.o_entry_d) = CURRENT_DATE) AS orders_today,
+               AVG(t.total_amount) AS avg_amount
+        FROM orders o
+        LEFT JOIN new_order no ON no.no_w_id = o.o_w_id AND no.no_d_id = o.o_d_id AND no.no_o_id = o.o_id
+        LEFT JOIN (
+            SELECT ol_w_id, ol_d_id, ol_o_id, SUM(ol_amount) as total_amount
+            FROM order_line
+            GROUP BY ol_w_id, ol_d_id, ol_o_id
+        ) t ON t.ol_w_id = o.o_w_id AND t.ol_d_id = o.o_d_id AND t.ol_o_id = o.o_id
+    """
+    _STATS_QUERY_BY_WAREHOUSE = _STATS_QUERY + "WHERE o.o_w_id = %s\n"
+
     def get_order_statistics(
         self, warehouse_id: Optional[int] = None
     ) -> Dict[str, Any]:
         """Get order statistics"""
         try:
-            stats = {}
-
-            # Base query conditions
-            where_clause = "WHERE 1=1"
-            params = []
-
             if warehouse_id:
-                where_clause += " AND o_w_id = %s"
-                params.append(warehouse_id)
-
-            # Total orders
-            total_query = f"SELECT COUNT(*) as count FROM orders {where_clause}"
-            total_result = self.db.execute_query(total_query, tuple(params))
-            stats["total_orders"] = total_result[0]["count"] if total_result else 0
-
-            # New orders
-            new_query = f"""
-                SELECT COUNT(*) as count 
-                FROM orders o 
-                JOIN new_order no ON no.no_w_id = o.o_w_id AND no.no_d_id = o.o_d_id AND no.no_o_id = o.o_id
-                {where_clause}
-            """
-            new_result = self.db.execute_query(new_query, tuple(params))
-            stats["new_orders"] = new_result[0]["count"] if new_result else 0
-
-            # Delivered orders
-            stats["delivered_orders"] = stats["total_orders"] - stats["new_orders"]
-
-            # Orders today
-            today_query = f"""
-                SELECT COUNT(*) as count 
-                FROM orders 
-                {where_clause} AND DATE(o_entry_d) = CURRENT_DATE
-            """
-            today_result = self.db.execute_query(today_query, tuple(params))
-            stats["orders_today"] = today_result[0]["count"] if today_result else 0
-
-            # Average order value
-            avg_query = f"""
-                SELECT AVG(total_amount) as avg_amount
-                FROM (
-                    SELECT SUM(ol_amount) as total_amount
-                    FROM order_line ol
-                    JOIN orders o ON o.o_w_id = ol.ol_w_id AND o.o_d_id = ol.ol_d_id AND o.o_id = ol.ol_o_id
-                    {where_clause.replace("o_w_id", "o.o_w_id")}
-                    GROUP BY ol.ol_w_id, ol.ol_d_id, ol.ol_o_id
-                ) as order_totals
-            """
-            avg_result = self.db.execute_query(avg_query, tuple(params))
-            stats["avg_order_value"] = (
-                float(avg_result[0]["avg_amount"])
-                if avg_result and avg_result[0]["avg_amount"]
-                else 0.0
-            )
+                row = self.db.execute_query(self._STATS_QUERY_BY_WAREHOUSE, (warehouse_id,))[0]
+            else:
+                row = self.db.execute_query(self._STATS_QUERY)[0]
+
+            stats = {
+                "total_orders": row["total_orders"],
+                "new_orders": row["new_orders"],
+                # Delivered orders
+                "delivered_orders": row["total_orders"] - row["new_orders"],
+                "orders_today": row["orders_today"],
+                "avg_order_value": float(row["avg_amount"]) if row["avg_amount"] else 0.0,
+            }
 
             return stats
 
         except Exception as e:
             logger.error(f"Get order statistics service error: {str(e)}")
             return {}
-
-   
\ No newline at end of file
@@ -3,43 +3,85 @@ Payment service for TPC-C operations
 """
 
 import logging
+from collections import namedtuple
+from datetime import datetime
 from typing import Any, Dict, List, Optional
-import psycopg2.extras
-from psycopg2.extras import RealDictCursor
 
 from database.base_connector import BaseDatabaseConnector
 
 logger = logging.getLogger(__name__)
 
+# Row returned by execute_payment, matching its INSERT ... RETURNING list
+PaymentRow = namedtuple("PaymentRow", "h_id h_c_id h_date h_amount h_data")
+
 
 class PaymentService:
     """Service class for payment-related operations"""
 
     def __init__(self, db_connector: BaseDatabaseConnector):
         self.db = db_connector
-        self.connection = db_connector.connection
 
     def execute_payment(self, warehouse_id: int, district_id: int, customer_id: int, amount: float):
-        """Run payment transaction in DB"""
+        """Run payment transaction in DB
+
+        The connector runs in autocommit mode, so the single INSERT commits
+        on its own without a BEGIN/COMMIT round-trip.
+        """
         try:
             logger.info(f"Inserting payment: W_ID={warehouse_id}, D_ID={district_id}, C_ID={customer_id}, Amount={amount}")
 
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    INSERT INTO History (h_w_id, h_c_d_id, h_c_w_id, h_d_id, h_c_id, h_date, h_amount, h_data)
-                    VALUES (%s, %s, %s, %s, %s, NOW(), %s, %s)
-                    RETURNING *;
-                """, (warehouse_id, district_id, warehouse_id, district_id, customer_id, amount, 'Payment transaction'))
-
-                
-                self.connection.commit()
-                return cur.fetchone()
+            params = (warehouse_id, district_id, warehouse_id, district_id, customer_id, amount, 'Payment transaction')
+            # execute_query PREPAREs this once per pooled connection (unless
+            # behind PgBouncer) and EXECUTEs it on later calls
+            rows = self.db.execute_query("""
+                INSERT INTO History (h_w_id, h_c_d_id, h_c_w_id, h_d_id, h_c_id, h_date, h_amount, h_data)
+                VALUES (%s, %s, %s, %s, %s, NOW(), %s, %s)
+                RETURNING h_id, h_c_id, h_date, h_amount, h_data
+            """, params)
+            return PaymentRow(**rows[0])
         except Exception as e:
-            self.connection.rollback()
             logger.error(f"DB Payment execution error: {e}", exc_info=True)
             raise
 
 
+    def execute_payments_bulk(self, payments: List[Dict[str, Any]]) -> List[int]:
+        """Insert many payments in batched multi-row INSERTs and return their h_ids.
+
+        Each payment dict needs warehouse_id, district_id, customer_id and amount.
+        All payments are inserted in one transaction: if any fails, none are.
+        """
+        if not payments:
+            return []
+        try:
+            rows = [
+                (
+                    p["warehouse_id"],
+                    p["district_id"],
+                    p["warehouse_id"],
+                    p["district_id"],
+                    p["customer_id"],
+                    p["amount"],
+                    "Payment transaction",
+                )
+                for p in payments
+            ]
+            # execute_many sends 500-row multi-row INSERTs inside one
+            # transaction, so either every payment is recorded or none is
+            result = self.db.execute_many(
+                """
+                INSERT INTO History (h_w_id, h_c_d_id, h_c_w_id, h_d_id, h_c_id, h_date, h_amount, h_data)
+                VALUES %s
+                RETURNING h_id
+                """,
+                rows,
+                page_size=500,
+                template="(%s, %s, %s, %s, %s, NOW(), %s, %s)",
+            )
+            return [row[0] for row in result]
+        except Exception as e:
+            logger.error(f"DB bulk payment execution error: {e}", exc_info=True)
+            raise
+
     def get_payment_history(
         self,
         warehouse_id: Optional[int] = None,
@@ -57,69 +99,6 @@ class PaymentService:
             return []
 
 
-    def get_payment_history_paginated(
-        self,
-        warehouse_id: Optional[int] = None,
-        district_id: Optional[int] = None,
-        customer_id: Optional[int] = None,
-        limit: int = 50,
-        offset: int = 0,
-    ) -> Dict[str, Any]:
-        """Fetch payment history from the DB with optional filters & pagination."""
-
-        try:
-            query = """
-                SELECT h_id, h_c_id, h_c_d_id, h_c_w_id, h_d_id, h_w_id, h_date, h_amount, h_data
-                FROM History
-                WHERE (%(warehouse_id)s IS NULL OR h_w_id = %(warehouse_id)s)
-                AND (%(district_id)s IS NULL OR h_c_d_id = %(district_id)s)
-                AND (%(customer_id)s IS NULL OR h_c_id = %(customer_id)s)
-                ORDER BY h_date DESC
-                LIMIT %(limit)s OFFSET %(offset)s
-            """
-            
-            params = {
-                "warehouse_id": warehouse_id,
-                "district_id": district_id,
-                "customer_id": customer_id,
-                "limit": limit,
-                "offset": offset
-            }
-
-            # Fetch all rows as dicts
-            rows = self.db.fetch_all(query, params)
-
-            # Get total count separately
-            count_query = """
-                SELECT COUNT(*) AS total
-                FROM History
-                WHERE (%(warehouse_id)s IS NULL OR h_w_id = %(warehouse_id)s)
-                AND (%(district_id)s IS NULL OR h_d_id = %(district_id)s)
-                AND (%(customer_id)s IS NULL OR h_c_id = %(customer_id)s)
-            """
-            count_result = self.db.fetch_one(count_query, params)
-            total_count = count_result["total"] if count_result else 0
-
-            return {
-                "payments": rows,
-                "total_count": total_count,
-                "limit": limit,
-                "offset": offset,
-                "has_next": (offset + limit) < total_count,
-                "has_prev": offset > 0
-            }
-
-        except Exception as e:
-            logger.error(f"Error loading payments: {str(e)}")
-            return {
-                "payments": [],
-                "total_count": 0,
-                "limit": limit,
-                "offset": offset,
-                "has_next": False,
-                "has_prev": False
-            }
-
     def get_customer_payment_summary(
         self, warehouse_id: int, district_id: int, customer_id: int
     ) -> Dict[str, Any]:
@@ -173,7 +152,6 @@ class PaymentService:
             stats_result = self.db.execute_query(
                 stats_query, (warehouse_id, district_id, customer_id)
             )
-            print(stats_result)
 
             payment_stats = stats_result[0] if stats_result else {}
 
@@ -195,41 +173,67 @@ class PaymentService:
         customer_id: Optional[int] = None,
         limit: int = 50,
         offset: int = 0,
+        after_date: Optional[datetime] = None,
+        after_id: Optional[int] = None,
     ) -> Dict[str, Any]:
-        """Fetch payment history with pagination."""
+        """Fetch payment history with pagination.
+
+        When after_date/after_id (the last row of the previous page) are given,
+        the page is located with a keyset seek on (h_date, h_id) instead of
+        OFFSET, so fetching a deep page costs O(limit) rather than O(offset).
+        The total comes from a separate COUNT that cached_count reuses per
+        filter, so paging does not rescan the filtered set every time.
+        """
         try:
+            keyset = after_date is not None and after_id is not None
             where_clause = """
                 WHERE (%(warehouse_id)s IS NULL OR h_w_id = %(warehouse_id)s)
-                  AND (%(district_id)s IS NULL OR h_d_id = %(district_id)s)
+                  AND (%(district_id)s IS NULL OR h_c_d_id = %(district_id)s)
                   AND (%(customer_id)s IS NULL OR h_c_id = %(customer_id)s)
             """
-            params = {
+            seek_clause = ""
+            if keyset:
+                seek_clause = """
+                  AND (h_date, h_id) < (%(after_date)s, %(after_id)s)
+                """
+            filter_params = {
                 "warehouse_id": warehouse_id,
                 "district_id": district_id,
                 "customer_id": customer_id,
-                "limit": limit,
-                "offset": offset,
+            }
+            params = {
+                **filter_params,
+                # One extra row tells whether a next page exists
+                "limit": limit + 1,
+                "offset": 0 if keyset else offset,
+                "after_date": after_date,
+                "after_id": after_id,
             }
 
-            # Fetch payment rows as dicts
-            payments = self.db.fetch_all(
+            rows = self.db.execute_query(
                 f"""
-                SELECT h_id, h_c_id, h_c_d_id, h_c_w_id, 
+                SELECT h_id, h_c_id, h_c_d_id, h_c_w_id,
                        h_d_id, h_w_id, h_date, h_amount, h_data
                 FROM History
                 {where_clause}
-                ORDER BY h_date DESC
+                {seek_clause}
+                ORDER BY h_date DESC, h_id DESC
                 LIMIT %(limit)s OFFSET %(offset)s
                 """,
-                params
+                params,
             )
-
-            # Fetch total count
-            total_row = self.db.fetch_one(
-                f"SELECT COUNT(*) AS total FROM History {where_clause}",
-                params
+            payments = rows[:limit]
+            has_next = len(rows) > limit
+            total_count = self.db.cached_count(
+                f"SELECT COUNT(*) AS total FROM History {where_clause}", filter_params
             )
-            total_count = total_row["total"] if total_row else 0
+
+            next_cursor = None
+            if has_next:
+                next_cursor = {
+                    "after_date": payments[-1]["h_date"],
+                    "after_id": payments[-1]["h_id"],
+                }
 
             # Compute total amount here (optional for KPIs)
             # for p in payments:
@@ -241,8 +245,9 @@ class PaymentService:
                 "total_count": total_count,
                 "limit": limit,
                 "offset": offset,
-                "has_next": (offset + limit) < total_count,
+                "has_next": has_next,
                 "has_prev": offset > 0,
+                "next_cursor": next_cursor,
                 # "total_amount": total_amount
             }
 
@@ -255,6 +260,7 @@ class PaymentService:
                 "offset": offset,
                 "has_next": False,
                 "has_prev": False,
+                "next_cursor": None,
                 "total_amount": 0
             }
 
@@ -284,43 +290,54 @@ class PaymentService:
     ) -> Dict[str, Any]:
         """Get payment trends over specified number of days"""
         try:
-            # Base query conditions
-            where_clause = "WHERE h_date >= CURRENT_DATE - INTERVAL '%s days'"
+            # Base query conditions; the day count is bound as a number and
+            # scaled to an interval rather than spliced into a quoted literal
+            where_clause = "WHERE h_date >= CURRENT_DATE - (%s * INTERVAL '1 day')"
             params = [days]
 
             if warehouse_id:
                 where_clause += " AND h_w_id = %s"
                 params.append(warehouse_id)
 
-            # Daily payment trends
-            daily_query = f"""
-                SELECT DATE(h_date) as payment_date,
+            # Daily trends and the amount distribution from a single scan: the
+            # empty grouping set adds one overall row carrying the distribution
+            trends_query = f"""
+                SELECT GROUPING(DATE(h_date)) as is_total,
+                       DATE(h_date) as payment_date,
                        COUNT(*) as payment_count,
                        SUM(h_amount) as total_amount,
-                       AVG(h_amount) as avg_amount
-                FROM history
-                {where_clause}
-                GROUP BY DATE(h_date)
-                ORDER BY payment_date DESC
-            """
-
-            daily_trends = self.db.execute_query(daily_query, tuple(params))
-
-            # Payment amount distribution
-            distribution_query = f"""
-                SELECT 
-                    COUNT(CASE WHEN h_amount < 100 THEN 1 END) as under_100,
-                    COUNT(CASE WHEN h_amount >= 100 AND h_amount < 500 THEN 1 END) as between_100_500,
-                    COUNT(CASE WHEN h_amount >= 500 AND h_amount < 1000 THEN 1 END) as between_500_1000,
-                    COUNT(CASE WHEN h_amount >= 1000 THEN 1 END) as over_1000
+                       AVG(h_amount) as avg_amount,
+                       COUNT(*) FILTER (WHERE h_amount < 100) as under_100,
+                       COUNT(*) FILTER (WHERE h_amount >= 100 AND h_amount < 500) as between_100_500,
+                       COUNT(*) FILTER (WHERE h_amount >= 500 AND h_amount < 1000) as between_500_1000,
+                       COUNT(*) FILTER (WHERE h_amount >= 1000) as over_1000
                 FROM history
                 {where_clause}
+                GROUP BY GROUPING SETS ((DATE(h_date)), ())
+                ORDER BY payment_date DESC NULLS LAST
             """
 
-            distribution_result = self.db.execute_query(
-                distribution_query, tuple(params)
-            )
-            distribution = distribution_result[0] if distribution_result else {}
+            rows = self.db.execute_query_tuples(trends_query, tuple(params))
+
+            daily_trends = []
+            distribution = {}
+            for row in rows:
+                if row.is_total:
+                    distribution = {
+                        "under_100": row.under_100,
+                        "between_100_500": row.between_100_500,
+                        "between_500_1000": row.between_500_1000,
+                        "over_1000": row.over_1000,
+                    }
+                else:
+                    daily_trends.append(
+                        {
+                            "payment_date": row.payment_date,
+                            "payment_count": row.payment_count,
+                            "total_amount": row.total_amount,
+                            "avg_amount": row.avg_amount,
+                        }
+                    )
 
             return {
                 "success": True,
@@ -347,46 +364,55 @@ class PaymentService:
             if amount > 10000:  # Arbitrary large amount check
                 errors.append("Payment amount exceeds maximum allowed")
 
-            # Check if customer exists
-            customer_query = """
-                SELECT c_id, c_first, c_last, c_balance, c_credit_lim
-                FROM customer
-                WHERE c_w_id = %s AND c_d_id = %s AND c_id = %s
+            # Customer and warehouse/district existence in one round-trip;
+            # the single-row anchor keeps a row even when either side is missing
+            lookup_query = """
+                SELECT c.c_id, c.c_first, c.c_last, c.c_balance, c.c_credit_lim,
+                       d.d_id, w.w_name
+                FROM (SELECT 1) anchor
+                LEFT JOIN customer c
+                    ON c.c_w_id = %s AND c.c_d_id = %s AND c.c_id = %s
+                LEFT JOIN (district d JOIN warehouse w ON w.w_id = d.d_w_id)
+                    ON d.d_w_id = %s AND d.d_id = %s
             """
 
-            customer_result = self.db.execute_query(
-                customer_query, (warehouse_id, district_id, customer_id)
-            )
-
-            if not customer_result:
+            with self.db.cursor() as cur:
+                cur.execute(
+                    lookup_query,
+                    (warehouse_id, district_id, customer_id, warehouse_id, district_id),
+                )
+                c_id, c_first, c_last, c_balance, c_credit_lim, d_id, w_name = cur.fetchone()
+
+            customer = None
+            if c_id is not None:
+                customer = {
+                    "c_id": c_id,
+                    "c_first": c_first,
+                    "c_last": c_last,
+                    "c_balance": c_balance,
+                    "c_credit_lim": c_credit_lim,
+                }
+
+            district = None
+            if d_id is not None:
+                district = {"d_id": d_id, "w_name": w_name}
+
+            if customer is None:
                 errors.append("Customer not found")
             else:
-                customer = customer_result[0]
                 # Check if payment would exceed credit limit (if applicable)
                 new_balance = customer["c_balance"] - amount
                 if new_balance < -customer["c_credit_lim"]:
                     errors.append("Payment would exceed customer credit limit")
 
-            # Check if warehouse and district exist
-            district_query = """
-                SELECT d_id, w.w_name
-                FROM district d
-                JOIN warehouse w ON w.w_id = d.d_w_id
-                WHERE d.d_w_id = %s AND d.d_id = %s
-            """
-
-            district_result = self.db.execute_query(
-                district_query, (warehouse_id, district_id)
-            )
-
-            if not district_result:
+            if district is None:
                 errors.append("Warehouse or district not found")
 
             return {
                 "valid": len(errors) == 0,
                 "errors": errors,
-                "customer": customer_result[0] if customer_result else None,
-                "district": district_result[0] if district_result else None,
+                "customer": customer,
+                "district": district,
             }
 
         except Exception as e:
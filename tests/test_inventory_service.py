@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Inventory Service Pagination Test
+Runs InventoryService.get_inventory_paginated against an in-memory connector
+"""
+
+import sys
+
+sys.path.append(".")
+
+from services.inventory_service import InventoryService
+
+
+class FakeStockConnector:
+    """Serves stock rows in primary-key order, honouring the LIMIT/OFFSET params"""
+
+    def __init__(self, count):
+        self.queries = []
+        self.rows = [
+            {
+                "s_i_id": i_id,
+                "s_w_id": 1,
+                "s_quantity": 50,
+                "s_ytd": 0,
+                "s_order_cnt": 0,
+                "s_data": "stock",
+                "i_name": f"Item {i_id}",
+                "i_price": 10,
+            }
+            for i_id in range(1, count + 1)
+        ]
+
+    def execute_query(self, query, params=None):
+        self.queries.append(query)
+        offset = params["offset"]
+        return [dict(row) for row in self.rows[offset:offset + params["limit"]]]
+
+    def cached_count(self, query, params=None):
+        return len(self.rows)
+
+
+def test_pages_are_ordered_and_uncounted():
+    """The page query is ordered and carries no window count"""
+    db = FakeStockConnector(7)
+
+    InventoryService(db).get_inventory_paginated(limit=5)
+
+    assert "ORDER BY s.s_w_id, s.s_i_id" in db.queries[0]
+    assert "OVER" not in db.queries[0]
+
+
+def test_next_page_detected_from_extra_row():
+    """has_next comes from the row past the page; the total from the count"""
+    service = InventoryService(FakeStockConnector(7))
+
+    first = service.get_inventory_paginated(limit=5)
+    last = service.get_inventory_paginated(limit=5, offset=5)
+
+    assert [row["s_i_id"] for row in first["inventory"]] == [1, 2, 3, 4, 5]
+    assert first["has_next"] is True and first["has_prev"] is False
+    assert [row["s_i_id"] for row in last["inventory"]] == [6, 7]
+    assert last["has_next"] is False and last["has_prev"] is True
+    assert first["total_count"] == last["total_count"] == 7
+
+
+def test_page_past_the_end_keeps_the_total():
+    """An empty page past the end still reports the full total"""
+    result = InventoryService(FakeStockConnector(7)).get_inventory_paginated(
+        limit=5, offset=50
+    )
+
+    assert result["inventory"] == []
+    assert result["total_count"] == 7
+    assert result["has_next"] is False
+
+
+if __name__ == "__main__":
+    test_pages_are_ordered_and_uncounted()
+    test_next_page_detected_from_extra_row()
+    test_page_past_the_end_keeps_the_total()
+    print("✅ Inventory pagination tests passed")
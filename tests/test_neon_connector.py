@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+NeonConnector Helper Test
+Tests the connector's pure SQL helpers without a database
+"""
+
+import sys
+from contextlib import contextmanager
+
+sys.path.append(".")
+
+from database.neon_connector import NeonConnector, _is_read_only
+
+
+class FakeCursor:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def fetchone(self):
+        return (7,)
+
+
+class FakeConnection:
+    def cursor(self):
+        return FakeCursor()
+
+
+def test_only_read_only_statements_are_retryable():
+    """Writes, locking reads and tpcc_* write functions are never retried"""
+    assert _is_read_only("SELECT i_price FROM item WHERE i_id = %s")
+    assert _is_read_only("WITH t AS (SELECT 1) SELECT * FROM t")
+    assert _is_read_only("SELECT * FROM tpcc_stock_level(%s, %s, %s)")
+
+    assert not _is_read_only("INSERT INTO history (h_id) VALUES (%s)")
+    assert not _is_read_only("SELECT * FROM orders WHERE o_id = %s FOR UPDATE")
+    assert not _is_read_only("SELECT * FROM tpcc_new_order(%s, %s, %s, %s, %s, %s)")
+    assert not _is_read_only(
+        "WITH next_id AS (UPDATE district SET d_next_o_id = d_next_o_id + 1 "
+        "RETURNING d_next_o_id) SELECT * FROM next_id"
+    )
+
+
+def test_gather_reads_passes_params_through_unchanged():
+    """Mapping params reach the statement as a mapping, not as its keys"""
+    connector = NeonConnector.__new__(NeonConnector)
+    seen = []
+
+    @contextmanager
+    def pooled_connection():
+        yield FakeConnection()
+
+    connector.pooled_connection = pooled_connection
+    connector._execute_cached = lambda conn, cur, query, params: seen.append(params)
+
+    for fetch in ("row", "value"):
+        seen.clear()
+        connector.gather_reads(
+            [("SELECT %(w_id)s", {"w_id": 1}), ("SELECT %s", (2,))], fetch=fetch
+        )
+        assert seen == [{"w_id": 1}, (2,)]
+
+
+if __name__ == "__main__":
+    test_only_read_only_statements_are_retryable()
+    test_gather_reads_passes_params_through_unchanged()
+    print("✅ NeonConnector helper tests passed")
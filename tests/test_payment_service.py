@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Payment Service Pagination Test
+Runs PaymentService.get_payment_history_paginated against an in-memory connector
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+sys.path.append(".")
+
+from services.payment_service import PaymentService
+
+
+class FakeHistoryConnector:
+    """Serves History rows newest first, honouring the LIMIT/OFFSET params"""
+
+    def __init__(self, count):
+        self.batches = []
+        start = datetime(2024, 1, 1)
+        self.rows = [
+            {
+                "h_id": h_id,
+                "h_c_id": 1,
+                "h_c_d_id": 1,
+                "h_c_w_id": 1,
+                "h_d_id": 1,
+                "h_w_id": 1,
+                "h_date": start + timedelta(minutes=h_id),
+                "h_amount": 10,
+                "h_data": "Payment transaction",
+            }
+            for h_id in range(count, 0, -1)
+        ]
+
+    def execute_query(self, query, params=None):
+        offset = params["offset"]
+        return [dict(row) for row in self.rows[offset:offset + params["limit"]]]
+
+    def cached_count(self, query, params=None):
+        return len(self.rows)
+
+    def execute_many(self, query, seq_of_params, page_size=100, template=None):
+        self.batches.append((query, list(seq_of_params), template))
+        return [(h_id,) for h_id in range(101, 101 + len(seq_of_params))]
+
+
+def test_total_count_matches_payments_with_huge_limit():
+    """A limit larger than the table returns every row and a matching total"""
+    service = PaymentService(FakeHistoryConnector(7))
+
+    result = service.get_payment_history_paginated(limit=1_000_000)
+
+    assert result["total_count"] == len(result["payments"]) == 7
+    assert result["has_next"] is False
+    assert result["next_cursor"] is None
+
+
+def test_next_page_detected_from_extra_row():
+    """has_next and the keyset cursor come from the row past the page"""
+    service = PaymentService(FakeHistoryConnector(7))
+
+    result = service.get_payment_history_paginated(limit=5)
+
+    assert len(result["payments"]) == 5
+    assert result["total_count"] == 7
+    assert result["has_next"] is True
+    assert result["next_cursor"] == {
+        "after_date": result["payments"][-1]["h_date"],
+        "after_id": result["payments"][-1]["h_id"],
+    }
+
+
+def test_bulk_payments_go_through_one_execute_many_call():
+    """Bulk payments are one all-or-nothing execute_many call returning h_ids"""
+    db = FakeHistoryConnector(0)
+    payments = [
+        {"warehouse_id": 1, "district_id": 2, "customer_id": c_id, "amount": 5}
+        for c_id in (1, 2, 3)
+    ]
+
+    h_ids = PaymentService(db).execute_payments_bulk(payments)
+
+    assert h_ids == [101, 102, 103]
+    assert len(db.batches) == 1
+    query, rows, template = db.batches[0]
+    assert "RETURNING h_id" in query
+    assert rows[0] == (1, 2, 1, 2, 1, 5, "Payment transaction")
+    assert "NOW()" in template
+
+
+if __name__ == "__main__":
+    test_total_count_matches_payments_with_huge_limit()
+    test_next_page_detected_from_extra_row()
+    test_bulk_payments_go_through_one_execute_many_call()
+    print("✅ Payment pagination tests passed")